@@ -0,0 +1,242 @@
+"""
+Overhead of the clients themselves, measured against the local benchmarks.mock_server: URL building and JSON decoding
+costs, per call latency (next to a bare requests.Session.get of the same URL), throughput of concurrent calls, and
+peak and retained memory of a large response. Needs no API key nor network. The server runs in the same process:
+compare results between runs of the same machine only.
+
+    python -m benchmarks.bench_client [--quick] [--transport requests|urllib3|inprocess] [--save NAME] [--compare NAME]
+
+``--transport inprocess`` serves the requests without sockets, with the routes of the mock server: what is left is
+the overhead of the client alone. The async clients always use aiohttp.
+
+``--save`` writes the results to benchmarks/results/NAME.json, defaulting to the package version. ``--compare`` prints
+the ratio of each result to a saved run, and exits with status 1 when one regressed beyond ``--threshold``.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+import urllib.parse
+
+import requests
+
+from benchmarks.mock_server import V2, V3, V4, MockServer
+from lunarcrush import LunarCrush, LunarCrushV3, LunarCrushV4
+from lunarcrush.transport import InProcessTransport
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS = os.path.join(_ROOT, 'benchmarks', 'results')
+_START = datetime.datetime(2024, 1, 1)
+
+
+class Results:
+    """
+    Results by name, each with its unit and whether lower or higher is better.
+    """
+
+    def __init__(self):
+        self.values = {}
+
+    def add(self, section, name, value, unit, better='lower'):
+        self.values[f'{section}/{name}'] = {'value': value, 'unit': unit, 'better': better}
+        print(f'  {name:<44} {value:12.3f} {unit}')
+
+
+def in_process(server):
+    def handler(url, headers):
+        parts = urllib.parse.urlsplit(url)
+        body = server.route(parts.path, urllib.parse.parse_qs(parts.query))
+        if body is None:
+            return 404, {'Content-Type': 'application/json'}, b'{"error": "Not found"}'
+        return 200, {'Content-Type': 'application/json', 'Content-Length': str(len(body))}, body
+
+    return InProcessTransport(handler)
+
+
+def clients(server, pool_size=10, transport='requests'):
+    if transport == 'inprocess':
+        transport = in_process(server)
+    v2 = LunarCrush('key', pool_size=pool_size, transport=transport)
+    v3 = LunarCrushV3('key', pool_size=pool_size, transport=transport)
+    v4 = LunarCrushV4('key', pool_size=pool_size, transport=transport)
+    v2._BASE_URL, v3._BASE_URL, v4._BASE_URL = server.url + V2, server.url + V3, server.url + V4
+    return v2, v3, v4
+
+
+def bench_encoding(results, v2, v3, v4, number):
+    print('URL building (_prepare)')
+    cases = {
+        'v4 coin': (v4, '/public/coins/{coin}/v1', {'coin': 'BTC'}),
+        'v4 list page': (v4, '/public/coins/list/v2',
+                         {'sort': 'market_cap', 'filter': None, 'limit': 1000, 'desc': True, 'page': 3}),
+        'v4 time series': (v4, '/public/coins/{coin}/time-series/v2',
+                           {'coin': 'BTC', 'bucket': 'hour', 'interval': None, 'start': _START, 'end': 1704200000}),
+        'v3 time series': (v3, '/coins/{coin}/time-series',
+                           {'coin': 'BTC', 'interval': '1w', 'start': _START, 'bucket': 'hour', 'data_points': 720}),
+        'v2 assets': (v2, 'assets', {'symbol': ['BTC', 'ETH'], 'data_points': 720, 'start': _START}),
+    }
+    for name, (client, endpoint, kwargs) in cases.items():
+        elapsed = min(timeit.repeat(lambda: client._prepare(endpoint, dict(kwargs)), number=number, repeat=5))
+        results.add('encode', name, elapsed / number * 1e6, 'us')
+
+
+def bench_decoding(results, server, v4, number):
+    print(f'JSON decoding ({v4._decode.__module__}), coin, 1000 row list page, 720 and 20000 row time series')
+    for name in ('coin', 'coins_list', 'time_series', 'historical'):
+        raw = server.payloads[name]
+        count = max(1, number * 1000 // len(raw))
+        elapsed = min(timeit.repeat(lambda: v4._decode(raw), number=count, repeat=3))
+        results.add('decode', name, elapsed / count * 1e3, 'ms')
+
+
+def _latencies(call, number):
+    call()  # Opens the connection
+    times = []
+    for _ in range(number):
+        started = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - started)
+    times.sort()
+    return statistics.median(times) * 1e3, times[int(len(times) * 0.95) - 1] * 1e3
+
+
+def bench_latency(results, server, v2, v3, v4, number):
+    print('Latency per call, median and p95')
+    session = requests.Session()
+    url = server.url + V4 + '/public/coins/BTC/v1'
+    cases = {
+        'requests.Session.get v4 coin (baseline)': (lambda: session.get(url).content, number),
+        'v4 get_coin': (lambda: v4.get_coin('BTC'), number),
+        'v4 get_coins_list_v2 (1000 rows)': (lambda: v4.get_coins_list_v2(limit=1000, page=1), number // 4),
+        'v4 get_coin_time_series (720 rows)': (lambda: v4.get_coin_time_series('BTC', start=_START), number // 4),
+        'v2 get_assets (720 rows)': (lambda: v2.get_assets(['BTC'], data_points=720), number // 4),
+        'v3 get_coin_historical (20000 rows)': (lambda: v3.get_coin_historical('BTC'), max(3, number // 40)),
+    }
+    for name, (call, count) in cases.items():
+        median, p95 = _latencies(call, count)
+        results.add('latency', name, median, 'ms')
+        results.add('latency', name + ' p95', p95, 'ms')
+    session.close()
+
+
+def bench_throughput(results, server, number, transport):
+    print('Throughput of get_coin')
+    for workers in (1, 8, 32):
+        v4 = clients(server, workers, transport)[2]
+        v4.map('get_coin', ['BTC'] * workers, max_workers=workers)  # Opens the connections
+        started = time.perf_counter()
+        v4.map('get_coin', ['BTC'] * number, max_workers=workers)
+        results.add('throughput', f'map, {workers} threads', number / (time.perf_counter() - started), 'calls/s',
+                    'higher')
+        v4.close()
+    try:
+        from lunarcrush import AsyncLunarCrushV4
+        AsyncLunarCrushV4('key')
+    except ImportError:
+        return
+
+    async def run(concurrency):
+        async with AsyncLunarCrushV4('key', pool_size=concurrency, max_concurrency=concurrency) as client:
+            client._BASE_URL = server.url + V4
+            await client.map('get_coin', ['BTC'] * concurrency)
+            started = time.perf_counter()
+            await client.map('get_coin', ['BTC'] * number)
+            return number / (time.perf_counter() - started)
+
+    for concurrency in (8, 32):
+        results.add('throughput', f'async map, {concurrency} concurrent', asyncio.run(run(concurrency)), 'calls/s',
+                    'higher')
+
+
+def bench_memory(results, v3):
+    print('Peak and retained memory of the 20000 row historical dump')
+    cases = {
+        'get_coin_historical': lambda: v3.get_coin_historical('BTC'),
+        'iter_coin_historical': lambda: sum(1 for _ in v3.iter_coin_historical('BTC')),
+    }
+    try:
+        import numpy  # noqa: F401
+        cases['get_coin_historical(as_arrays=True)'] = lambda: v3.get_coin_historical('BTC', as_arrays=True)
+    except ImportError:
+        pass
+    for name, call in cases.items():
+        call()
+        tracemalloc.start()
+        result = call()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        results.add('memory', name + ' peak', peak / 1e6, 'MB')
+        results.add('memory', name + ' retained', retained / 1e6, 'MB')
+
+
+def _default_name():
+    with open(os.path.join(_ROOT, 'pyproject.toml')) as file:
+        return re.search(r'^version = "(.+)"', file.read(), re.MULTILINE).group(1)
+
+
+def save(results, name, decoder, transport):
+    os.makedirs(RESULTS, exist_ok=True)
+    path = os.path.join(RESULTS, name + '.json')
+    meta = {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+            'json_decoder': decoder, 'transport': transport, 'date': datetime.date.today().isoformat()}
+    with open(path, 'w') as file:
+        json.dump({'meta': meta, 'results': results.values}, file, indent=2, sort_keys=True)
+        file.write('\n')
+    print(f'Saved {path}')
+
+
+def compare(results, name, threshold):
+    """
+    :return: The names of the results worse than the saved ones by more than ``threshold`` times.
+    """
+    with open(os.path.join(RESULTS, name + '.json')) as file:
+        saved = json.load(file)['results']
+    print(f'Compared to {name} (>1 is worse)')
+    regressions = []
+    for key, result in results.values.items():
+        before = saved.get(key)
+        if before is None or not before['value'] or not result['value']:
+            continue
+        ratio = result['value'] / before['value']
+        ratio = 1 / ratio if result['better'] == 'higher' else ratio
+        flag = ' REGRESSION' if ratio > threshold else ''
+        print(f'  {key:<56} {ratio:6.2f}{flag}')
+        if ratio > threshold:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='Fewer iterations, for a smoke test')
+    parser.add_argument('--transport', choices=('requests', 'urllib3', 'inprocess'), default='requests')
+    parser.add_argument('--save', nargs='?', const='', metavar='NAME', help='Defaults to the package version')
+    parser.add_argument('--compare', metavar='NAME')
+    parser.add_argument('--threshold', type=float, default=1.25, help='Ratio counted as a regression')
+    args = parser.parse_args()
+    number = 40 if args.quick else 400
+    results = Results()
+    with MockServer() as server:
+        v2, v3, v4 = clients(server, transport=args.transport)
+        bench_encoding(results, v2, v3, v4, number * 50)
+        bench_decoding(results, server, v4, number)
+        bench_latency(results, server, v2, v3, v4, number)
+        bench_throughput(results, server, number * 2, args.transport)
+        bench_memory(results, v3)
+    if args.save is not None:
+        save(results, args.save or _default_name(), v4._decode.__module__, args.transport)
+    if args.compare is not None and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
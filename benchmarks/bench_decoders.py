@@ -0,0 +1,75 @@
+"""
+JSON decoding of representative v3/v4 payloads: requests' Response.json(), as the clients used to decode, against
+the decoders of lunarcrush.decoders parsing the raw bytes.
+
+    python -m benchmarks.bench_decoders
+"""
+import json
+import random
+import timeit
+
+import requests
+
+from lunarcrush.decoders import DECODERS
+
+random.seed(0)
+_COIN_FIELDS = ('price', 'price_btc', 'volume_24h', 'volatility', 'circulating_supply', 'max_supply',
+                'percent_change_1h', 'percent_change_24h', 'percent_change_7d', 'percent_change_30d', 'market_cap',
+                'interactions_24h', 'social_volume_24h', 'social_dominance', 'market_dominance', 'galaxy_score',
+                'alt_rank', 'sentiment')
+_SERIES_FIELDS = ('open', 'close', 'high', 'low', 'volume_24h', 'market_cap', 'circulating_supply', 'sentiment',
+                  'contributors_active', 'contributors_created', 'posts_active', 'posts_created', 'interactions',
+                  'social_dominance', 'galaxy_score', 'volatility', 'alt_rank', 'spam')
+
+
+def coins_list_page():
+    # v4 /public/coins/list/v2?limit=1000
+    return {'config': {'sort': 'market_cap_rank', 'limit': 1000, 'page': 0, 'total_rows': 4500},
+            'data': [dict({'id': i, 'symbol': f'C{i}', 'name': f'Coin {i}', 'categories': 'defi,layer-1',
+                           'logo': f'https://cdn.lunarcrush.com/coin-{i}.png', 'market_cap_rank': i + 1},
+                          **{field: random.random() * 10 ** random.randint(0, 9) for field in _COIN_FIELDS})
+                     for i in range(1000)]}
+
+
+def time_series(points):
+    # v4 /public/coins/:coin/time-series/v2, v3 /coins/:coin/historical
+    return {'config': {'id': '1', 'bucket': 'hour'},
+            'data': [dict({'time': 1_600_000_000 + i * 3600},
+                          **{field: round(random.random() * 10 ** random.randint(0, 9), 4) for field in _SERIES_FIELDS})
+                     for i in range(points)]}
+
+
+def response(content):
+    res = requests.Response()
+    res._content = content
+    res.status_code = 200
+    res.headers['Content-Type'] = 'application/json'
+    return res
+
+
+def main():
+    payloads = {
+        'v4 coins list, 1000 rows': coins_list_page(),
+        'v4 hourly time series, 720 rows': time_series(720),
+        'v3 historical dump, 20000 rows': time_series(20000),
+    }
+    decoders = {}
+    for name, load in DECODERS.items():
+        try:
+            decoders[name] = load()
+        except ImportError:
+            pass
+    for title, payload in payloads.items():
+        raw = json.dumps(payload).encode()
+        number = max(1, 2_000_000 // len(raw))
+        baseline = min(timeit.repeat(lambda: response(raw).json(), number=number, repeat=5)) / number
+        print(f'{title} ({len(raw) / 1e6:.2f} MB)')
+        print(f'  {"Response.json()":<16} {baseline * 1e3:8.2f} ms')
+        for name, decode in decoders.items():
+            assert decode(raw) == payload
+            elapsed = min(timeit.repeat(lambda: decode(raw), number=number, repeat=5)) / number
+            print(f'  {name:<16} {elapsed * 1e3:8.2f} ms  x{baseline / elapsed:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Import time of the package and of a client, each measured in fresh interpreters, with the heavy dependencies they
+load. Exits with status 1 when a median exceeds its budget or a deferred dependency gets imported, to keep the cold
+starts of short-lived jobs (CLIs, serverless functions) fast.
+
+    python -m benchmarks.bench_import [--runs 15]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Statement -> (budget in ms, modules it must not import)
+SCENARIOS = {
+    'import lunarcrush': (10, ('requests', 'aiohttp', 'numpy', 'asyncio')),
+    'from lunarcrush import LunarCrushV4': (100, ('requests', 'aiohttp', 'numpy', 'asyncio')),
+    "from lunarcrush import LunarCrushV4; LunarCrushV4('key')": (150, ('requests', 'aiohttp', 'numpy', 'asyncio')),
+    'from lunarcrush import AsyncLunarCrushV4': (1000, ('requests', 'numpy')),
+}
+_HEAVY = ('requests', 'urllib3', 'aiohttp', 'asyncio', 'numpy', 'pandas', 'pyarrow', 'orjson', 'msgspec', 'ujson')
+
+_SCRIPT = '''
+import sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(elapsed * 1000, ','.join(name for name in {heavy!r} if name in sys.modules))
+'''
+
+
+def measure(statement, runs):
+    """
+    :return: The median import time in ms, and the heavy modules imported.
+    """
+    times = []
+    loaded = ''
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', _SCRIPT.format(statement=statement, heavy=_HEAVY)],
+                                check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout.split()
+        times.append(float(output[0]))
+        loaded = output[1] if len(output) > 1 else ''
+    return statistics.median(times), [name for name in loaded.split(',') if name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=15)
+    args = parser.parse_args()
+    failed = False
+    print(f'{"statement":60} {"median":>9} {"budget":>8}  heavy modules')
+    for statement, (budget, forbidden) in SCENARIOS.items():
+        median, loaded = measure(statement, args.runs)
+        unexpected = [name for name in loaded if name in forbidden]
+        over = median > budget
+        failed = failed or over or bool(unexpected)
+        flag = ' OVER BUDGET' if over else ''
+        flag += f' UNEXPECTED {",".join(unexpected)}' if unexpected else ''
+        print(f'{statement:60} {median:7.1f}ms {budget:6}ms  {",".join(loaded) or "-"}{flag}')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
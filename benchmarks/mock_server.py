@@ -0,0 +1,151 @@
+"""
+Local stand-in for the LunarCrush v2, v3 and v4 APIs, serving payloads shaped like recorded responses: small objects,
+1000 row list pages, time series and multi-MB historical dumps. The payloads are generated once, with a fixed seed,
+and encoded before the server starts, so that serving them costs next to nothing.
+
+    python -m benchmarks.mock_server [--port 8000]
+
+The clients are pointed at it through their base URL, e.g. ``client._BASE_URL = server.url + '/api4'``.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.bench_decoders import _COIN_FIELDS, coins_list_page, time_series
+
+# Base path of each API on the server
+V2, V3, V4 = '/v2', '/api3', '/api4'
+
+
+def coin(i=1):
+    # v4 /public/coins/:coin/v1, v3 /coins/:coin
+    rng = random.Random(i)
+    return {'config': {'coin': str(i), 'generated': 1_700_000_000},
+            'data': dict({'id': i, 'symbol': 'BTC', 'name': 'Bitcoin', 'categories': 'layer-1'},
+                         **{field: rng.random() * 10 ** rng.randint(0, 9) for field in _COIN_FIELDS})}
+
+
+def v2_assets(points):
+    # v2 ?data=assets&symbol=BTC&data_points=720
+    series = time_series(points)['data']
+    return {'config': {'data': 'assets', 'symbol': 'BTC', 'data_points': points},
+            'data': [dict(coin()['data'], timeSeries=series)]}
+
+
+def payloads() -> dict:
+    """
+    :return: The encoded payloads by name.
+    """
+    random.seed(0)
+    return {name: json.dumps(payload).encode() for name, payload in (
+        ('coin', coin()),
+        ('coins_list', coins_list_page()),
+        ('time_series', time_series(720)),
+        ('historical', time_series(20000)),
+        ('v2_assets', v2_assets(720)),
+        ('v2_meta', {'data': [{'id': i, 'symbol': f'C{i}', 'name': f'Coin {i}'} for i in range(2000)]}),
+    )}
+
+
+# (regex on the path, payload name)
+ROUTES = (
+    (re.compile(r'^/api4/public/coins/list/v[12]$'), 'coins_list'),
+    (re.compile(r'^/api4/public/coins/[^/]+/time-series/v2$'), 'time_series'),
+    (re.compile(r'^/api4/public/(coins|stocks|topic)/[^/]+/v1$'), 'coin'),
+    (re.compile(r'^/api3/coins/[^/]+/historical$'), 'historical'),
+    (re.compile(r'^/api3/coins/[^/]+/time-series$'), 'time_series'),
+    (re.compile(r'^/api3/coins/[^/]+$'), 'coin'),
+)
+# v2 serves everything from one path, by ?data=
+V2_ROUTES = {'assets': 'v2_assets', 'meta': 'v2_meta'}
+
+
+class MockServer:
+    """
+    The server runs on a daemon thread, one thread per connection, keeping the connections alive.
+
+    :ivar str url: Base URL of the server, e.g. 'http://127.0.0.1:8000'.
+    :ivar int requests: Number of requests served.
+    """
+
+    def __init__(self, port: int = 0):
+        self.payloads = payloads()
+        self.requests = 0
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+        self.url = f'http://127.0.0.1:{self._server.server_port}'
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # The headers and the body are written separately, Nagle's algorithm would hold the body back
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server.requests += 1
+                path, _, query = self.path.partition('?')
+                body = server.route(path, urllib.parse.parse_qs(query))
+                status = 200 if body is not None else 404
+                body = body if body is not None else b'{"error": "Not found"}'
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def route(self, path: str, query: dict):
+        """
+        :return: The payload served for a request, or None for a 404.
+        """
+        if path == V2:
+            name = V2_ROUTES.get(query.get('data', [''])[0])
+            return self.payloads[name] if name is not None else None
+        for pattern, name in ROUTES:
+            if pattern.match(path):
+                return self.payloads[name]
+        return None
+
+    def start(self) -> 'MockServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+    server = MockServer(args.port)
+    for name, payload in server.payloads.items():
+        print(f'{name:<12} {len(payload) / 1e6:6.2f} MB')
+    print(f'Serving v2 at {server.url}{V2}, v3 at {server.url}{V3}, v4 at {server.url}{V4}')
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,33 @@
-from lunarcrush.lcv2 import LunarCrush
-from lunarcrush.lcv3 import LunarCrushV3
-from lunarcrush.lcv4 import LunarCrushV4
+import importlib
+import sys
 
-__all__ = ['LunarCrush', 'LunarCrushV3', 'LunarCrushV4']
+# Name -> module defining it. The modules are imported on first access of one of their names: importing lunarcrush
+# alone loads neither requests nor aiohttp.
+_LAZY = {
+    'LunarCrush': 'lunarcrush.lcv2',
+    'LunarCrushV3': 'lunarcrush.lcv3',
+    'LunarCrushV4': 'lunarcrush.lcv4',
+    'AsyncLunarCrushV3': 'lunarcrush.aio',
+    'AsyncLunarCrushV4': 'lunarcrush.aio',
+}
+
+__all__ = ['LunarCrush', 'LunarCrushV3', 'LunarCrushV4', 'AsyncLunarCrushV3', 'AsyncLunarCrushV4']
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+# Module __getattr__ (PEP 562) needs Python 3.7
+if sys.version_info < (3, 7):
+    for _name in __all__:
+        globals()[_name] = __getattr__(_name)
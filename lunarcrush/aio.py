@@ -0,0 +1,346 @@
+import asyncio
+import collections
+import hashlib
+import os
+import time
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from lunarcrush.base import LunarCrushABC
+from lunarcrush.coalesce import AsyncSingleFlight
+from lunarcrush.columns import TimeSeries
+from lunarcrush.lcv3 import LunarCrushV3
+from lunarcrush.lcv4 import LunarCrushV4
+from lunarcrush.streaming import ArrayStreamParser
+
+
+class _Response:
+    """
+    aiohttp response, with the attributes of a requests.Response used by the clients. Either fully read, or streamed
+    from ``raw`` and then released with :meth:`close`.
+    """
+
+    def __init__(self, status_code, headers, content, raw=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.raw = raw
+
+    def raise_for_status(self):
+        if self.raw is not None:
+            self.raw.raise_for_status()
+
+    def close(self):
+        if self.raw is not None:
+            self.raw.release()
+
+
+class AsyncLunarCrushMixin:
+    """
+    Runs the requests of a LunarCrush client on asyncio: every endpoint method returns a coroutine instead of the
+    response, and the ``iter_*`` methods return asynchronous iterators. All the requests of a client share one aiohttp
+    connection pool, and at most ``max_concurrency`` of them are in flight at the same time.
+    """
+
+    def __init__(self, api_key, max_concurrency: int = 100, **kwargs):
+        """
+        :param str api_key: LunarCrush API key.
+        :param int max_concurrency: Maximum number of requests in flight at the same time.
+        """
+        if aiohttp is None:
+            raise ImportError('aiohttp is required by the async clients: pip install "lunarcrush-v4[async]"')
+        super().__init__(api_key, **kwargs)
+        self._max_concurrency = max_concurrency
+        if self._single_flight is not None:
+            self._single_flight = AsyncSingleFlight()
+        self._async_session = None
+        self._semaphore = None
+
+    def __enter__(self):
+        raise TypeError('Use "async with" with the async clients')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the underlying connection pool.
+        """
+        session, self._async_session = self._async_session, None
+        if session is not None:
+            await session.close()
+
+    async def map(self, method: str or callable, items: list, max_workers: int = None, progress: callable = None,
+                  **kwargs) -> list:
+        """
+        Coroutine version of :meth:`LunarCrushABC.map`. ``max_workers`` further limits the number of calls of this
+        batch in flight, on top of ``max_concurrency``.
+        """
+        func = getattr(self, method) if isinstance(method, str) else method
+        items = list(items)
+        limit = asyncio.Semaphore(max_workers or len(items) or 1)
+        done = 0
+
+        async def call(item):
+            nonlocal done
+            async with limit:
+                try:
+                    return await func(*(item if isinstance(item, tuple) else (item,)), **kwargs)
+                except Exception as error:
+                    return error
+                finally:
+                    done += 1
+                    if progress is not None:
+                        progress(done, len(items))
+
+        return list(await asyncio.gather(*(call(item) for item in items)))
+
+    def _client_timeout(self):
+        if isinstance(self._timeout, tuple):
+            connect, read = self._timeout
+            return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+        return aiohttp.ClientTimeout(total=self._timeout)
+
+    def _get_async_session(self):
+        # Both the session and the semaphore bind to the running event loop, so they are created on first use.
+        if self._async_session is None or self._async_session.closed:
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._pool_size),
+                headers=self._headers,
+                timeout=self._client_timeout(),
+            )
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._async_session
+
+    async def _get(self, url, headers=None, stream=False):
+        session = self._get_async_session()
+        retries = self.rate_limiter.max_retries if self.rate_limiter is not None else 0
+        for attempt in range(retries + 1):
+            if self.rate_limiter is not None:
+                await asyncio.sleep(self.rate_limiter.reserve())
+            response = await session.get(url, headers=headers)
+            if stream:
+                result = _Response(response.status, response.headers, None, response)
+            else:
+                async with response:
+                    result = _Response(response.status, response.headers, await response.read())
+            limited = False
+            if self.rate_limiter is not None:
+                limited = self.rate_limiter.update(result.status_code, result.headers, result.content)
+            if not limited or attempt == retries:
+                return result
+            result.close()
+
+    async def _send(self, endpoint, url, headers=None, stream=False, idempotent=True):
+        breaker = self.circuit_breakers[self._endpoint_family(endpoint)] if self.circuit_breakers else None
+        retry = self.retry if idempotent else None
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            if breaker is not None:
+                breaker.before()
+            error = response = None
+            try:
+                response = await self._get(url, headers, stream)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+            except Exception as e:
+                # A cancellation by the caller, e.g. by a wait_for timeout, is not a failure of the endpoint.
+                # CancelledError is an Exception before Python 3.8.
+                if breaker is not None and isinstance(e, asyncio.CancelledError):
+                    breaker.release()
+                elif breaker is not None:
+                    breaker.record(False)
+                raise
+            except BaseException:
+                # Cancelled or interrupted, e.g. by a KeyboardInterrupt
+                if breaker is not None:
+                    breaker.release()
+                raise
+            if breaker is not None:
+                breaker.record(error is None and response.status_code < 500)
+            if error is None and (retry is None or response.status_code not in retry.statuses):
+                return response
+            delay = retry.next_delay(attempt, started) if retry is not None else None
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            if response is not None:
+                response.close()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _request(self, endpoint, **kwargs):
+        path, url, key, ttl, idempotent = self._prepare(endpoint, kwargs)
+        entry = self.cache.get(key) if key is not None else None
+        if entry is not None and entry.fresh:
+            return entry.value
+        if self._single_flight is None or not idempotent:
+            return await self._fetch(path, url, key, ttl, entry, idempotent)
+        return await self._single_flight.do(key or url, lambda: self._fetch(path, url, key, ttl, entry, idempotent))
+
+    async def _stream(self, endpoint, **kwargs):
+        path, url = self._prepare(endpoint, kwargs)[:2]
+        self._get_async_session()
+        async with self._semaphore:
+            # Retried, throttled and guarded by the circuit breakers like the other requests, up to the headers
+            response = await self._send(path, url, stream=True)
+            try:
+                response.raise_for_status()
+                parser = ArrayStreamParser()
+                async for chunk in response.raw.content.iter_chunked(self._STREAM_CHUNK_SIZE):
+                    for row in parser.feed(chunk):
+                        yield row
+                for row in parser.feed(b'', final=True):
+                    yield row
+            finally:
+                response.close()
+
+    async def _paginate(self, endpoint, page_size: int, prefetch: int, **kwargs):
+        method = self._page_method(endpoint)
+        pending = collections.deque()
+        next_page = 0
+        last_page = None
+        try:
+            pending.append(asyncio.ensure_future(method(limit=page_size, page=next_page, **kwargs)))
+            next_page += 1
+            while pending:
+                response = await pending.popleft()
+                rows = response.get('data')
+                if rows is None:
+                    error = response.get('error')
+                    raise ValueError("No 'data' array in the response" + (f': {error}' if error else ''))
+                total = (response.get('config') or {}).get('total_rows')
+                if last_page is None and isinstance(total, int):
+                    last_page = max(total - 1, 0) // page_size
+                if len(rows) < page_size:
+                    for row in rows:
+                        yield row
+                    return
+                while len(pending) < prefetch and (last_page is None or next_page <= last_page):
+                    pending.append(asyncio.ensure_future(method(limit=page_size, page=next_page, **kwargs)))
+                    next_page += 1
+                for row in rows:
+                    yield row
+                if not pending and (last_page is None or next_page <= last_page):
+                    pending.append(asyncio.ensure_future(method(limit=page_size, page=next_page, **kwargs)))
+                    next_page += 1
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    async def _records(response, record_type, as_records: bool):
+        return LunarCrushABC._records(await response, record_type, as_records)
+
+    @staticmethod
+    async def _time_series(response, as_arrays: bool):
+        response = await response
+        return TimeSeries.from_response(response) if as_arrays else response
+
+    async def _fetch_range(self, func, start, end, bucket: str, chunk_points: int, max_workers: int = None) -> dict:
+        return self._stitch_range(await self.map(func, self._chunk_range(start, end, bucket, chunk_points),
+                                                 max_workers=max_workers), start, end)
+
+    async def _download(self, endpoint, path: str, progress: callable = None, checksum: str = 'sha256',
+                        compressed: bool = False, **kwargs) -> dict:
+        if compressed:
+            raise ValueError('The async clients always decompress the downloads')
+        endpoint, url = self._prepare(endpoint, kwargs)[:2]
+        self._get_async_session()
+        digest = hashlib.new(checksum)
+        size = 0
+        async with self._semaphore:
+            response = await self._send(endpoint, url, stream=True)
+            try:
+                response.raise_for_status()
+                total = response.raw.content_length if 'Content-Encoding' not in response.headers else None
+                with open(path + '.part', 'wb') as file:
+                    async for chunk in response.raw.content.iter_chunked(self._STREAM_CHUNK_SIZE):
+                        file.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+                        if progress is not None:
+                            progress(size, total)
+            finally:
+                response.close()
+        os.replace(path + '.part', path)
+        return {'path': path, 'size': size, 'checksum': digest.hexdigest(), 'encoding': None}
+
+    async def _fetch(self, endpoint, url, key, ttl, entry, idempotent=True):
+        self._get_async_session()
+        async with self._semaphore:
+            response = await self._send(endpoint, url, entry.validators() if entry is not None else None,
+                                        idempotent=idempotent)
+        if entry is not None and response.status_code == 304:
+            self.cache.refresh(key, entry, ttl, response.headers)
+            return entry.value
+        data = self._decode(response.content)
+        if key is not None and self._is_cacheable(response, data):
+            self.cache.set(key, data, ttl, response.headers, len(response.content))
+        return data
+
+
+class AsyncLunarCrushV3(AsyncLunarCrushMixin, LunarCrushV3):
+    """
+    asyncio version of :class:`LunarCrushV3`. The coin and NFT id maps can not be downloaded on first use: await
+    :meth:`load_ids` before using :meth:`get_coin_id` or :meth:`get_nft_id`, unless a fresh snapshot is available at
+    ``ids_path``.
+    """
+
+    async def load_ids(self):
+        """
+        Load the coin and NFT id maps from the snapshot if fresh, download them otherwise.
+        """
+        await asyncio.gather(*(self._aload_ids(name) for name in self._ID_MAPS))
+
+    async def refresh_ids(self):
+        """
+        Download the coin and NFT id maps again, and update the snapshot.
+        """
+        await asyncio.gather(*(self._aload_ids(name, force=True) for name in self._ID_MAPS))
+
+    async def _aload_ids(self, name, force=False):
+        snapshot = self._read_ids_snapshot().get(name)
+        if not force and snapshot is not None and time.time() - snapshot['saved'] < self._ids_max_age:
+            self._ids[name] = (snapshot['ids'], snapshot['saved'])
+            return
+        method = self._ID_MAPS[name][0]
+        self._set_ids(name, self._index_ids(name, await getattr(self, method)()))
+
+    def _load_ids(self, name):
+        snapshot = self._read_ids_snapshot().get(name)
+        if snapshot is not None and time.time() - snapshot['saved'] < self._ids_max_age:
+            return snapshot['ids'], snapshot['saved']
+        raise RuntimeError('The id maps of the async client must be loaded with "await load_ids()"')
+
+
+class AsyncLunarCrushV4(AsyncLunarCrushMixin, LunarCrushV4):
+    """
+    asyncio version of :class:`LunarCrushV4`.
+    """
+
+    async def snapshot_universe(self, kind: str, sort: str = None, filter: str = None, desc: bool = None,
+                                page_size: int = 1000, max_workers: int = None) -> dict:
+        spec = self._universe_endpoint(kind)
+
+        def method(page):
+            return self._request(spec.path, sort=sort, filter=filter, limit=page_size, desc=desc, page=page)
+
+        max_workers = max_workers or self._pool_size
+        started = time.time()
+        pages = [await method(0)]
+        total = self._snapshot_total(pages[0])
+        while spec.paginated and (len(pages[-1].get('data') or []) >= page_size
+                                  and (total is None or len(pages) * page_size < total)):
+            count = max_workers if total is None else -(-total // page_size) - len(pages)
+            items = range(len(pages), len(pages) + count)
+            pages += self._snapshot_pages(await self.map(method, items, max_workers=max_workers))
+        return self._snapshot_result(kind, pages, total, started)
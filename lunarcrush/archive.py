@@ -0,0 +1,158 @@
+import os
+
+from lunarcrush.base import _timestamp
+from lunarcrush.frames import _columns, to_arrow
+
+# pyarrow and numpy are imported by the functions, only when used
+
+_FORMATS = {'arrow': '.arrow', 'parquet': '.parquet'}
+_PARTITIONS = {'year': 'Y', 'month': 'M', 'day': 'D'}
+
+
+def export_series(result, path: str, format: str = 'arrow', partition: str = 'month') -> list:
+    """
+    Write a time series, e.g. a historical dump, to a directory of Arrow IPC or Parquet files, one per period. The
+    rows of a period already exported are replaced by the new ones with the same time, the others are kept, so that a
+    series can be exported again as it grows.
+
+    Arrow IPC files are written uncompressed to be memory-mapped by :func:`read_series`: the processes reading the
+    same files share their pages. Parquet files are compressed, smaller but decoded on every read.
+
+    The metrics are stored as float64, even when all their values are integers: the type of a column stays the same
+    from one export to the next, whether a batch has missing values or not.
+
+    :param result: TimeSeries, JSON response or rows, e.g. ``iter_file('btc.json')`` or ``iter_coin_historical()``.
+    :param str path: Directory to write the files to, created if missing.
+    :param str format: 'arrow' or 'parquet'.
+    :param str partition: 'year', 'month', 'day', or None for a single file.
+    :return: The files written.
+    """
+    import numpy as np
+    import pyarrow.compute as pc
+
+    extension = _FORMATS[format]
+    series = _columns(result)
+    table = _floats(to_arrow(series))
+    os.makedirs(path, exist_ok=True)
+    if partition is None:
+        groups = {'all': None}
+    else:
+        keys = series.time.astype('datetime64[s]').astype(f'datetime64[{_PARTITIONS[partition]}]').astype(str)
+        groups = {key: np.flatnonzero(keys == key) for key in np.unique(keys)}
+    files = []
+    for key, indices in groups.items():
+        part = table if indices is None else table.take(indices)
+        file = os.path.join(path, key + extension)
+        if os.path.exists(file):
+            existing = _floats(_read_file(file, None))
+            kept = existing.filter(pc.invert(pc.is_in(existing['time'], value_set=part['time'])))
+            part = _concat([kept, part])
+        part = part.sort_by('time')
+        _write_file(part, file, format)
+        files.append(file)
+    return files
+
+
+def read_series(path: str, start=None, end=None, columns: list = None):
+    """
+    Read a time series written by :func:`export_series`. Arrow IPC files are memory-mapped instead of read: only the
+    pages of the columns used are loaded, and shared with the other processes reading them.
+
+    :param str path: Directory of the files.
+    :param datetime.datetime or int start: Only return the rows from this time, included.
+    :param datetime.datetime or int end: Only return the rows before this time.
+    :param list columns: Only read these columns, ``time`` is always read.
+    :rtype: pyarrow.Table
+    """
+    import pyarrow as pa
+
+    start = _timestamp(start) if start is not None else None
+    end = _timestamp(end) if end is not None else None
+    columns = ['time'] + [column for column in columns if column != 'time'] if columns is not None else None
+    tables = []
+    for name in sorted(os.listdir(path)):
+        key, extension = os.path.splitext(name)
+        if extension not in _FORMATS.values() or not _overlaps(key, start, end):
+            continue
+        tables.append(_read_file(os.path.join(path, name), columns))
+    if not tables:
+        return pa.table({'time': pa.array([], pa.timestamp('s', tz='UTC'))})
+    table = _concat(tables)
+    if start is not None or end is not None:
+        table = table.filter(_time_mask(table, start, end))
+    return table
+
+
+def _overlaps(key, start, end):
+    # A partition key is the start of its period, e.g. '2024', '2024-01' or '2024-01-31'
+    import numpy as np
+
+    if key == 'all':
+        return True
+    unit = {4: 'Y', 7: 'M', 10: 'D'}.get(len(key))
+    if unit is None:
+        return False
+    first = np.datetime64(key, unit)
+    period_start = int(first.astype('datetime64[s]').astype(np.int64))
+    period_end = int((first + 1).astype('datetime64[s]').astype(np.int64))
+    return (start is None or period_end > start) and (end is None or period_start < end)
+
+
+def _time_mask(table, start, end):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    time = table['time']
+    mask = None
+    if start is not None:
+        mask = pc.greater_equal(time, pa.scalar(start, time.type))
+    if end is not None:
+        before = pc.less(time, pa.scalar(end, time.type))
+        mask = before if mask is None else pc.and_(mask, before)
+    return mask
+
+
+def _floats(table):
+    # The integer columns other than time as float64, the type they get with a missing value
+    import pyarrow as pa
+
+    for index, field in enumerate(table.schema):
+        if field.name != 'time' and pa.types.is_integer(field.type):
+            table = table.set_column(index, field.name, table[field.name].cast(pa.float64()))
+    return table
+
+
+def _concat(tables):
+    import pyarrow as pa
+
+    try:
+        return pa.concat_tables(tables, promote_options='default')
+    except TypeError:
+        # pyarrow < 14
+        return pa.concat_tables(tables, promote=True)
+
+
+def _read_file(file, columns):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if file.endswith(_FORMATS['parquet']):
+        table = pq.read_table(file, columns=columns, memory_map=True)
+        # Parquet has no second timestamps, they are stored as milliseconds
+        return table.set_column(table.schema.get_field_index('time'), 'time',
+                                table['time'].cast(pa.timestamp('s', tz='UTC')))
+    table = pa.ipc.open_file(pa.memory_map(file)).read_all()
+    return table.select(columns) if columns is not None else table
+
+
+def _write_file(table, file, format):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    temp = file + '.part'
+    if format == 'parquet':
+        pq.write_table(table, temp)
+    else:
+        with pa.OSFile(temp, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(temp, file)
@@ -1,11 +1,382 @@
+import datetime
+import functools
+import hashlib
+import os
+import threading
+import time
 from abc import ABC
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from lunarcrush.cache import ResponseCache
+from lunarcrush.coalesce import SingleFlight
+from lunarcrush.columns import TimeSeries, series_rows
+from lunarcrush.decoders import get_decoder
+from lunarcrush.ratelimit import RateLimiter
+from lunarcrush.retry import CircuitBreakers, RetryPolicy
+from lunarcrush.streaming import iter_array
+from lunarcrush.transport import Transport, get_transport
+
+
+_BUCKET_SECONDS = {'hour': 60 * 60, 'day': 24 * 60 * 60}
+
+
+def _timestamp(value) -> int:
+    if isinstance(value, datetime.datetime):
+        return int(time.mktime(value.timetuple()))
+    return int(value)
 
 
 class LunarCrushABC(ABC):
     _BASE_URL = ''
+    # Number of leading path segments naming the endpoint family of a request, e.g. '/coins' for '/coins/BTC/meta'
+    _FAMILY_DEPTH = 2
+    _STREAM_CHUNK_SIZE = 64 * 1024
+    # Path template -> Endpoint, requested with the encoders of their declaration instead of _parse_kwargs/_gen_url
+    ENDPOINTS = {}
 
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, pool_size: int = 10, timeout: float or tuple = (3.05, 30),
+                 rate_limit: str or RateLimiter = None, retry: RetryPolicy = None,
+                 circuit_breakers: CircuitBreakers = None, cache: ResponseCache or bool = None,
+                 coalesce: bool = False, json_decoder: str or callable = 'auto',
+                 transport: str or Transport = 'requests'):
+        """
+        :param str api_key: LunarCrush API key.
+        :param int pool_size: Maximum number of keep-alive connections kept open to the API host.
+        :param float or tuple timeout: Request timeout in seconds, either a single value or a (connect, read) tuple.
+        :param str or RateLimiter rate_limit: Plan tier ('individual', 'pro', 'enterprise') or RateLimiter to
+                                              schedule the requests with. No throttling by default.
+        :param RetryPolicy retry: How to retry idempotent requests failing with a transient error. No retries by
+                                  default.
+        :param CircuitBreakers circuit_breakers: Circuit breakers making requests to a failing endpoint family fail
+                                                 fast. Disabled by default.
+        :param ResponseCache or bool cache: Cache for the responses of the slowly changing endpoints, True for an
+                                            in-memory one with the default TTLs. Disabled by default.
+        :param bool coalesce: Share one request between the identical calls made at the same time, from any thread.
+        :param str or callable json_decoder: JSON library decoding the response bodies from their raw bytes: 'orjson',
+                                             'msgspec', 'ujson', 'json', or a function. Defaults to the fastest one
+                                             installed.
+        :param str or Transport transport: What sends the requests: 'requests', 'urllib3', or a Transport such as
+                                           a ReplayTransport. The async clients always use aiohttp.
+        """
         self._api_key = api_key
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self.rate_limiter = RateLimiter.from_tier(rate_limit) if isinstance(rate_limit, str) else rate_limit
+        self.retry = retry
+        self.circuit_breakers = circuit_breakers
+        self.cache = ResponseCache() if cache is True else cache or None
+        self._single_flight = SingleFlight() if coalesce else None
+        self._decode = get_decoder(json_decoder)
+        self._headers = self._build_headers()
+        self.transport = get_transport(transport)
+        self._transport_open = False
+        self._transport_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Close the underlying connection pool. The client can still be used afterwards, a new pool is opened on the
+        next request.
+        """
+        with self._transport_lock:
+            if self._transport_open:
+                self.transport.close()
+                self._transport_open = False
+
+    def map(self, method: str or callable, items: list, max_workers: int = None, progress: callable = None,
+            **kwargs) -> list:
+        """
+        Call an endpoint method once per item, concurrently on a thread pool, e.g.
+        ``lc.map('get_coin', ['BTC', 'ETH'])``. A failed call does not abort the batch: its exception is returned in
+        place of its result.
+
+        :param str or callable method: Name of the client method to call, or the bound method itself.
+        :param list items: One item per call. Tuples are unpacked as positional arguments, anything else is passed as
+                           the first argument.
+        :param int max_workers: Number of calls running at the same time. Defaults to the connection pool size.
+        :param callable progress: Called as ``progress(done, total)`` each time a call finishes.
+        :param kwargs: Keyword arguments passed to every call.
+        :return: The results (or exceptions) in the same order as ``items``.
+        """
+        func = getattr(self, method) if isinstance(method, str) else method
+        items = list(items)
+        results = [None] * len(items)
+        with ThreadPoolExecutor(max_workers=max_workers or self._pool_size) as executor:
+            futures = {
+                executor.submit(func, *(item if isinstance(item, tuple) else (item,)), **kwargs): i
+                for i, item in enumerate(items)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                error = future.exception()
+                results[futures[future]] = error if error is not None else future.result()
+                if progress is not None:
+                    progress(done, len(items))
+        return results
+
+    def _build_headers(self) -> dict:
+        return {}
+
+    def _get_transport(self):
+        # The transport is shared between threads, only its opening needs to be serialized. It imports its HTTP
+        # library when opened: the async clients never import requests.
+        if not self._transport_open:
+            with self._transport_lock:
+                if not self._transport_open:
+                    self.transport.open(self._headers, self._pool_size, self._timeout)
+                    self._transport_open = True
+        return self.transport
+
+    def _get(self, url, headers=None, stream=False):
+        transport = self._get_transport()
+        if self.rate_limiter is None:
+            return transport.get(url, headers, stream)
+        for attempt in range(self.rate_limiter.max_retries + 1):
+            self.rate_limiter.acquire()
+            response = transport.get(url, headers, stream)
+            # A streamed body is left unread: a rate limit reported in it raises when parsed
+            limited = self.rate_limiter.update(response.status_code, response.headers,
+                                               None if stream else response.content)
+            if not limited or attempt == self.rate_limiter.max_retries:
+                return response
+            response.close()
+
+    def _endpoint_family(self, endpoint):
+        return '/'.join(endpoint.split('/')[:self._FAMILY_DEPTH])
+
+    def _is_idempotent(self, endpoint):
+        return True
+
+    def _send(self, endpoint, url, headers=None, stream=False, idempotent=True):
+        breaker = self.circuit_breakers[self._endpoint_family(endpoint)] if self.circuit_breakers else None
+        retry = self.retry if idempotent else None
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            if breaker is not None:
+                breaker.before()
+            error = response = None
+            try:
+                response = self._get(url, headers, stream)
+            except self.transport.errors as e:
+                error = e
+            except Exception:
+                if breaker is not None:
+                    breaker.record(False)
+                raise
+            except BaseException:
+                # Interrupted, e.g. by a KeyboardInterrupt: not a failure of the endpoint
+                if breaker is not None:
+                    breaker.release()
+                raise
+            if breaker is not None:
+                breaker.record(error is None and response.status_code < 500)
+            if error is None and (retry is None or response.status_code not in retry.statuses):
+                return response
+            delay = retry.next_delay(attempt, started) if retry is not None else None
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _parse_kwargs(kwargs):
+        raise NotImplementedError('Parse kwargs method not implemented')
+
+    def _gen_url(self, endpoint, **kwargs):
+        raise NotImplementedError('Generate url method not implemented')
+
+    def _prepare(self, endpoint, kwargs):
+        """
+        :param str endpoint: Path template of a declared endpoint, or path.
+        :param dict kwargs: Path fields and query parameters.
+        :return: The path, the URL, the cache key (None if not cached), the TTL and whether the request is idempotent.
+        """
+        spec = self.ENDPOINTS.get(endpoint)
+        if spec is not None:
+            path, query = spec.encode(kwargs)
+            url = self._BASE_URL + path + query
+            ttl = self.cache.ttl(path, spec.ttl) if self.cache is not None else 0
+            # The declared endpoints authenticate with a header, their URL is the key
+            return path, url, url if ttl else None, ttl, spec.idempotent
+        kwargs = self._parse_kwargs(kwargs)
+        url = self._gen_url(endpoint, **kwargs)
+        ttl = self.cache.ttl(endpoint) if self.cache is not None else 0
+        key = self.cache.key(self._BASE_URL + endpoint, kwargs) if ttl else None
+        return endpoint, url, key, ttl, self._is_idempotent(endpoint)
+
+    @staticmethod
+    def _is_cacheable(response, data):
+        # v4 reports some errors, like exceeded rate limits, with a 200 status
+        return response.status_code == 200 and not (isinstance(data, dict) and 'error' in data)
 
     def _request(self, endpoint, **kwargs):
-        raise NotImplementedError('Request method not implemented')
+        path, url, key, ttl, idempotent = self._prepare(endpoint, kwargs)
+        entry = self.cache.get(key) if key is not None else None
+        if entry is not None and entry.fresh:
+            return entry.value
+        if self._single_flight is None or not idempotent:
+            return self._fetch(path, url, key, ttl, entry, idempotent)
+        return self._single_flight.do(key or url, lambda: self._fetch(path, url, key, ttl, entry, idempotent))
+
+    def _stream(self, endpoint, **kwargs):
+        """
+        Request an endpoint and yield the rows of the ``data`` array of its response one at a time, as the body is
+        received, instead of decoding it whole.
+        """
+        path, url = self._prepare(endpoint, kwargs)[:2]
+        with self._send(path, url, stream=True) as response:
+            response.raise_for_status()
+            yield from iter_array(response.iter_content(chunk_size=self._STREAM_CHUNK_SIZE))
+
+    def _paginate(self, endpoint, page_size: int, prefetch: int, **kwargs):
+        """
+        Request a paginated endpoint page after page and yield the rows of every page. The next ``prefetch`` pages
+        are requested on background threads while the rows of the current one are consumed. Pages requested but not
+        started yet are cancelled when the generator is closed early.
+
+        :param str endpoint: Path template of an endpoint declared ``paginated``.
+        :param int page_size: Rows per page.
+        :param int prefetch: Number of pages requested ahead of the one being consumed.
+        """
+        method = self._page_method(endpoint)
+        executor = ThreadPoolExecutor(max_workers=max(prefetch, 1))
+        pending = deque()
+        next_page = 0
+        last_page = None
+        try:
+            pending.append(executor.submit(method, limit=page_size, page=next_page, **kwargs))
+            next_page += 1
+            while pending:
+                response = pending.popleft().result()
+                rows = response.get('data')
+                if rows is None:
+                    error = response.get('error')
+                    raise ValueError("No 'data' array in the response" + (f': {error}' if error else ''))
+                total = (response.get('config') or {}).get('total_rows')
+                if last_page is None and isinstance(total, int):
+                    last_page = max(total - 1, 0) // page_size
+                if len(rows) < page_size:
+                    yield from rows
+                    return
+                while len(pending) < prefetch and (last_page is None or next_page <= last_page):
+                    pending.append(executor.submit(method, limit=page_size, page=next_page, **kwargs))
+                    next_page += 1
+                yield from rows
+                if not pending and (last_page is None or next_page <= last_page):
+                    pending.append(executor.submit(method, limit=page_size, page=next_page, **kwargs))
+                    next_page += 1
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _page_method(self, endpoint):
+        spec = self.ENDPOINTS.get(endpoint)
+        if spec is None or not spec.paginated:
+            raise ValueError(f'{endpoint} is not a paginated endpoint')
+        return functools.partial(self._request, endpoint)
+
+    def _fetch_range(self, func, start, end, bucket: str, chunk_points: int, max_workers: int = None) -> dict:
+        """
+        Split the ``[start, end)`` time range into chunks of at most ``chunk_points`` buckets, fetch them concurrently
+        and stitch their time series back together.
+
+        :param callable func: Called as ``func(chunk_start, chunk_end, data_points)`` with unix timestamps, returns
+                              the response of one chunk.
+        :param datetime.datetime or int start: Start of the range, included.
+        :param datetime.datetime or int end: End of the range, excluded.
+        :param str bucket: 'hour' or 'day'.
+        :param int chunk_points: Maximum number of buckets per request.
+        :param int max_workers: Number of chunks requested at the same time. Defaults to the connection pool size.
+        :return: The ``config`` of the first chunk and the rows of the range sorted by time, each timestamp once.
+        """
+        return self._stitch_range(self.map(func, self._chunk_range(start, end, bucket, chunk_points),
+                                           max_workers=max_workers), start, end)
+
+    @staticmethod
+    def _records(response, record_type, as_records: bool):
+        if not as_records:
+            return response
+        rows = response.get('data')
+        if rows is None:
+            error = response.get('error')
+            raise ValueError("No 'data' array in the response" + (f': {error}' if error else ''))
+        return record_type.from_rows(rows)
+
+    @staticmethod
+    def _time_series(response, as_arrays: bool):
+        return TimeSeries.from_response(response) if as_arrays else response
+
+    @staticmethod
+    def _chunk_range(start, end, bucket, chunk_points):
+        step = _BUCKET_SECONDS[bucket]
+        start, end = _timestamp(start), _timestamp(end)
+        chunks = []
+        while start < end:
+            chunk_end = min(start + chunk_points * step, end)
+            chunks.append((start, chunk_end, -(-(chunk_end - start) // step)))
+            start = chunk_end
+        return chunks
+
+    @staticmethod
+    def _stitch_range(responses, start, end) -> dict:
+        start, end = _timestamp(start), _timestamp(end)
+        rows = {}
+        for response in responses:
+            if isinstance(response, Exception):
+                raise response
+            for row in series_rows(response):
+                if start <= row['time'] < end:
+                    rows.setdefault(row['time'], row)
+        return {'config': responses[0].get('config', {}) if responses else {},
+                'data': [rows[timestamp] for timestamp in sorted(rows)]}
+
+    def _download(self, endpoint, path: str, progress: callable = None, checksum: str = 'sha256',
+                  compressed: bool = False, **kwargs) -> dict:
+        """
+        Request an endpoint and write its response body to a file as it is received, without decoding it.
+
+        :param str path: File to write. The body is written to ``path + '.part'`` first, then renamed.
+        :param callable progress: Called as ``progress(received, total)`` after every chunk, with the number of bytes
+                                  received so far and the Content-Length of the response (None if unknown).
+        :param str checksum: hashlib algorithm of the checksum of the file.
+        :param bool compressed: Write the body as sent by the server (e.g. gzip) instead of decompressing it.
+        :return: The ``path``, ``size`` in bytes, ``checksum`` and content ``encoding`` of the file.
+        """
+        endpoint, url = self._prepare(endpoint, kwargs)[:2]
+        digest = hashlib.new(checksum)
+        size = 0
+        with self._send(endpoint, url, stream=True) as response:
+            response.raise_for_status()
+            total = response.headers.get('Content-Length')
+            total = int(total) if total is not None else None
+            encoding = response.headers.get('Content-Encoding') if compressed else None
+            with open(path + '.part', 'wb') as file:
+                for chunk in response.raw.stream(self._STREAM_CHUNK_SIZE, decode_content=not compressed):
+                    file.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+                    if progress is not None:
+                        progress(response.raw.tell(), total)
+        os.replace(path + '.part', path)
+        return {'path': path, 'size': size, 'checksum': digest.hexdigest(), 'encoding': encoding}
+
+    def _fetch(self, endpoint, url, key, ttl, entry, idempotent=True):
+        response = self._send(endpoint, url, entry.validators() if entry is not None else None, idempotent=idempotent)
+        if entry is not None and response.status_code == 304:
+            self.cache.refresh(key, entry, ttl, response.headers)
+            return entry.value
+        data = self._decode(response.content)
+        if key is not None and self._is_cacheable(response, data):
+            self.cache.set(key, data, ttl, response.headers, len(response.content))
+        return data
@@ -0,0 +1,279 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+_MINUTE = 60
+_HOUR = 60 * _MINUTE
+_DAY = 24 * _HOUR
+
+
+class CacheEntry:
+    """
+    Cached response, with the validators to revalidate it once expired.
+
+    :ivar value: Decoded response.
+    :ivar float expires: time.time() after which the response must be revalidated.
+    :ivar str etag: ETag header of the response.
+    :ivar str last_modified: Last-Modified header of the response.
+    :ivar int size: Size of the response body in bytes, approximating the memory taken by the decoded response.
+    """
+    __slots__ = ('value', 'expires', 'etag', 'last_modified', 'size')
+
+    def __init__(self, value, expires: float, etag: str = None, last_modified: str = None, size: int = 0):
+        self.value = value
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+        self.size = size
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires > time.time()
+
+    def validators(self) -> dict:
+        """
+        :return: The conditional request headers revalidating this response.
+        """
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class CacheBackend(ABC):
+    """
+    Storage of the :class:`CacheEntry` of a :class:`ResponseCache`.
+    """
+
+    @abstractmethod
+    def get(self, key: str):
+        """
+        :return: The CacheEntry stored under ``key``, or None.
+        """
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    def __len__(self):
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """
+    In-process cache keeping at most ``max_entries`` responses and ``max_bytes`` of response bodies, evicting the least
+    recently used ones. The size of a response is the one of its body: the decoded response takes a few times more
+    memory. The cached responses are returned as is, not copied: do not modify them.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        """
+        :param int max_entries: Maximum number of responses.
+        :param int max_bytes: Maximum total size of the response bodies. A larger response is not cached.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous.size
+            if entry.size > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self.size += entry.size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self.size -= self._entries.popitem(last=False)[1].size
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry.size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    On-disk cache in a SQLite database, shared by the processes using the same file. Keeps at most ``max_entries``
+    responses, evicting the least recently used ones.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS responses '
+            '(key TEXT PRIMARY KEY, value TEXT, expires REAL, etag TEXT, last_modified TEXT, accessed REAL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute(
+                'SELECT value, expires, etag, last_modified FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute('UPDATE responses SET accessed = ? WHERE key = ?', (time.time(), key))
+        value, expires, etag, last_modified = row
+        return CacheEntry(json.loads(value), expires, etag, last_modified)
+
+    def set(self, key, entry):
+        value = json.dumps(entry.value)
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses (key, value, expires, etag, last_modified, accessed) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, value, entry.expires, entry.etag, entry.last_modified, time.time())
+            )
+            self._db.execute(
+                'DELETE FROM responses WHERE key IN '
+                '(SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+
+    def delete(self, key):
+        with self._lock:
+            self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def clear(self):
+        with self._lock:
+            self._db.execute('DELETE FROM responses')
+
+    def close(self):
+        self._db.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+
+class ResponseCache:
+    """
+    Caches the responses of the endpoints having a time to live, keyed on the endpoint and its normalized parameters.
+    Only the slowly changing endpoints (lists, metadata) have a TTL by default, declared with their endpoint (see
+    :class:`lunarcrush.endpoints.Endpoint`) or in :attr:`DEFAULT_TTLS`. Override or extend them with ``ttls``.
+
+    Expired responses served with an ``ETag`` or ``Last-Modified`` header are kept to be revalidated with a
+    conditional request: a 304 Not Modified answer refreshes them without downloading the body again.
+    """
+
+    # TTLs of the endpoints not declared in an endpoint table (v2)
+    DEFAULT_TTLS = (
+        (r'^meta$', _DAY),
+    )
+
+    def __init__(self, backend: CacheBackend = None, ttls: dict = None, default_ttl: float = 0):
+        """
+        :param CacheBackend backend: Where to store the responses. Defaults to a MemoryBackend.
+        :param dict ttls: Time to live in seconds by endpoint regex, e.g. ``{r'^/public/topic/': 60}``. Checked before
+                          the default ones, a TTL of 0 disables the cache for the matching endpoints.
+        :param float default_ttl: Time to live of the responses of the endpoints having no TTL.
+        """
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.default_ttl = default_ttl
+        self._ttls = [(re.compile(pattern), ttl) for pattern, ttl in (ttls or {}).items()]
+        self._default_ttls = [(re.compile(pattern), ttl) for pattern, ttl in self.DEFAULT_TTLS]
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def ttl(self, endpoint: str, declared: float = None) -> float:
+        """
+        :param str endpoint: Path of the request.
+        :param float declared: TTL declared by the endpoint, used unless overridden by ``ttls``.
+        """
+        for pattern, ttl in self._ttls:
+            if pattern.search(endpoint):
+                return ttl
+        if declared is not None:
+            return declared
+        for pattern, ttl in self._default_ttls:
+            if pattern.search(endpoint):
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def key(url: str, params: dict) -> str:
+        return url + '?' + urllib.parse.urlencode(sorted(params.items()))
+
+    def get(self, key: str):
+        """
+        :return: The CacheEntry of the response, fresh or to revalidate, or None.
+        """
+        entry = self.backend.get(key)
+        if entry is not None and entry.fresh:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        if entry is not None and (entry.etag is not None or entry.last_modified is not None):
+            return entry
+        return None
+
+    def set(self, key: str, value, ttl: float, headers=None, size: int = 0):
+        """
+        :param headers: Headers of the response, to get its validators from.
+        :param int size: Size of the response body in bytes, counted against the ``max_bytes`` of a MemoryBackend.
+        """
+        headers = headers if headers is not None else {}
+        self.backend.set(key, CacheEntry(value, time.time() + ttl, headers.get('ETag'), headers.get('Last-Modified'),
+                                         size))
+
+    def refresh(self, key: str, entry: CacheEntry, ttl: float, headers=None):
+        """
+        Extend the life of a response revalidated by a 304 Not Modified answer.
+        """
+        self.revalidations += 1
+        entry.expires = time.time() + ttl
+        if headers is not None:
+            entry.etag = headers.get('ETag', entry.etag)
+            entry.last_modified = headers.get('Last-Modified', entry.last_modified)
+        self.backend.set(key, entry)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        """
+        :return: Hits, misses, 304 revalidations and number of entries, e.g.
+                 ``{'hits': 12, 'misses': 3, 'revalidations': 1, 'size': 3}``.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'revalidations': self.revalidations,
+                'size': len(self.backend)}
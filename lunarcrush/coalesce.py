@@ -0,0 +1,73 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call for a key is in flight, the other callers with the same key
+    wait for it and share its result (or exception) instead of making their own.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: callable):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+        try:
+            result = func()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """
+    asyncio version of :class:`SingleFlight`, coalescing the calls made from one event loop.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key: str, func: callable):
+        # Imported here rather than with the module, which the sync clients import too
+        import asyncio
+
+        call = self._calls.get(key)
+        if call is None:
+            # The call runs in its own task: a caller cancelled, e.g. by a wait_for timeout, stops waiting for it
+            # without cancelling it for the others
+            task = asyncio.ensure_future(func())
+            call = self._calls[key] = [task, 0]
+            task.add_done_callback(lambda done: self._done(key, done))
+        task = call[0]
+        call[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if call[1] == 1 and not task.done():
+                # Nobody else is waiting for the result, the next caller starts a new call
+                del self._calls[key]
+                task.cancel()
+            raise
+        finally:
+            call[1] -= 1
+
+    def _done(self, key, task):
+        if self._calls.get(key, [None])[0] is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved, the callers (if any) get it from the task
+            task.exception()
@@ -0,0 +1,105 @@
+def _numpy():
+    # numpy is imported by the first TimeSeries, not with the clients
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('numpy is required by TimeSeries: pip install "lunarcrush-v4[numpy]"') from None
+    return numpy
+
+
+def series_rows(response: dict) -> list:
+    """
+    :return: The rows of the time series of a response, also when nested in the asset as by the v2 and v3 APIs.
+    """
+    data = response.get('data')
+    if data is None:
+        error = response.get('error')
+        raise ValueError("No 'data' array in the response" + (f': {error}' if error else ''))
+    if isinstance(data, list) and len(data) == 1 and isinstance(data[0], dict) and 'timeSeries' in data[0]:
+        data = data[0]
+    if isinstance(data, dict):
+        data = data.get('timeSeries') or []
+    return data
+
+
+class TimeSeries:
+    """
+    Time series stored column by column in NumPy arrays: ``time`` as int64 unix timestamps, the metrics as float64
+    with NaN where a bucket has no value. Metrics with non numeric values are kept in object arrays.
+
+    :ivar dict columns: Metric name -> array, in the order the metrics first appear.
+    :ivar dict config: ``config`` of the response.
+    """
+
+    def __init__(self, columns: dict, config: dict = None):
+        _numpy()
+        self.columns = columns
+        self.config = config if config is not None else {}
+
+    @classmethod
+    def from_rows(cls, rows, config: dict = None, ints: bool = False) -> 'TimeSeries':
+        """
+        :param rows: Rows of a time series, e.g. the ``data`` of a response or the items of an ``iter_*`` method.
+        :param bool ints: Keep the columns holding integers only, and no missing value, as int64.
+        """
+        np = _numpy()
+        rows = rows if isinstance(rows, list) else list(rows)
+        count = len(rows)
+        values = {}
+        for i, row in enumerate(rows):
+            for name, value in row.items():
+                column = values.get(name)
+                if column is None:
+                    column = values[name] = [None] * count
+                column[i] = value
+        columns = {}
+        for name, column in values.items():
+            integer = name == 'time' or ints and all(type(value) is int for value in column)
+            try:
+                array = np.array(column, dtype=np.int64 if integer else np.float64)
+            except (TypeError, ValueError):
+                array = None
+            if array is None or array.ndim != 1:
+                array = np.empty(count, dtype=object)
+                for i, value in enumerate(column):
+                    array[i] = value
+            columns[name] = array
+        return cls(columns, config)
+
+    @classmethod
+    def from_response(cls, response: dict) -> 'TimeSeries':
+        return cls.from_rows(series_rows(response), response.get('config'))
+
+    @property
+    def time(self):
+        return self.columns['time']
+
+    @property
+    def names(self) -> list:
+        return list(self.columns)
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def to_pandas(self, index: str = 'time'):
+        """
+        See :func:`lunarcrush.frames.to_pandas`.
+        """
+        from lunarcrush.frames import to_pandas
+        return to_pandas(self, index)
+
+    def to_arrow(self, nan_as_null: bool = False):
+        """
+        See :func:`lunarcrush.frames.to_arrow`.
+        """
+        from lunarcrush.frames import to_arrow
+        return to_arrow(self, nan_as_null)
+
+    def __repr__(self):
+        return f'<TimeSeries {len(self)} buckets x {len(self.columns)} columns>'
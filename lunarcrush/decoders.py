@@ -0,0 +1,44 @@
+import json
+
+
+def _stdlib():
+    # json.loads detects the encoding of bytes itself, without a separate decoding to str
+    return json.loads
+
+
+def _orjson():
+    import orjson
+    return orjson.loads
+
+
+def _msgspec():
+    import msgspec
+    return msgspec.json.Decoder().decode
+
+
+def _ujson():
+    import ujson
+    return ujson.loads
+
+
+DECODERS = {'orjson': _orjson, 'msgspec': _msgspec, 'ujson': _ujson, 'json': _stdlib}
+
+
+def get_decoder(decoder: str or callable = 'auto'):
+    """
+    :param str or callable decoder: Name of a JSON library ('orjson', 'msgspec', 'ujson' or 'json'), 'auto' for the
+                                    fastest one installed, or a function decoding bytes.
+    :return: A function decoding a JSON document from the raw bytes of a response body.
+    :raises ImportError: If the library named is not installed.
+    """
+    if callable(decoder):
+        return decoder
+    if decoder != 'auto':
+        if decoder not in DECODERS:
+            raise ValueError(f'Unknown JSON decoder {decoder!r}, expected one of auto, {", ".join(DECODERS)}')
+        return DECODERS[decoder]()
+    for load in DECODERS.values():
+        try:
+            return load()
+        except ImportError:
+            pass
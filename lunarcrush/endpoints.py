@@ -0,0 +1,85 @@
+import datetime
+import string
+import time
+import urllib.parse
+
+# Parameter types, selecting the encoder of a parameter
+TIME = 'time'
+BOOL = 'bool'
+LIST = 'list'
+
+
+def _encode_time(value):
+    return int(time.mktime(value.timetuple())) if isinstance(value, datetime.datetime) else value
+
+
+def _encode_bool(value):
+    return value.real if isinstance(value, bool) else value
+
+
+def _encode_list(value):
+    return ','.join(value) if isinstance(value, list) else value
+
+
+def _encode_any(value):
+    if isinstance(value, list):
+        return ','.join(value)
+    if isinstance(value, datetime.datetime):
+        return int(time.mktime(value.timetuple()))
+    if isinstance(value, bool):
+        return value.real
+    return value
+
+
+_ENCODERS = {TIME: _encode_time, BOOL: _encode_bool, LIST: _encode_list, None: _encode_any}
+
+
+class Endpoint:
+    """
+    Declaration of an API endpoint: its path template, its query parameters and how the client layers handle it. The
+    path and the query string are built by encoders compiled once from the declaration.
+
+    :ivar str path: Path template, e.g. '/public/coins/{coin}/v1'.
+    :ivar tuple params: Names of the query parameters.
+    :ivar float ttl: Time to live of its responses in the cache, None to use the TTLs of the cache.
+    :ivar bool idempotent: Whether the request can be retried and coalesced.
+    :ivar bool paginated: Whether it takes ``limit`` and ``page`` parameters, to be walked page after page.
+    :ivar str universe: Kind of asset it lists in full, e.g. 'coins', or None.
+    """
+    __slots__ = ('path', 'params', 'ttl', 'idempotent', 'paginated', 'universe', '_segments', '_query')
+
+    def __init__(self, path: str, params: tuple = (), ttl: float = None, idempotent: bool = True,
+                 paginated: bool = False, universe: str = None):
+        """
+        :param tuple params: Query parameters, as names or (name, type) tuples with type TIME, BOOL or LIST.
+        """
+        params = tuple((param, None) if isinstance(param, str) else param for param in params)
+        self.path = path
+        self.params = tuple(name for name, _ in params)
+        self.ttl = ttl
+        self.idempotent = idempotent
+        self.paginated = paginated
+        self.universe = universe
+        self._segments = tuple((literal, field) for literal, field, _, _ in string.Formatter().parse(path))
+        self._query = tuple((name, urllib.parse.quote_plus(name) + '=', _ENCODERS[kind]) for name, kind in params)
+
+    def encode(self, kwargs: dict) -> tuple:
+        """
+        :param dict kwargs: Path fields and query parameters. The parameters set to None are left out.
+        :return: The path, and the query string starting with '?' or empty.
+        """
+        path = ''.join(literal + urllib.parse.quote(str(kwargs[field]), safe='') if field else literal
+                       for literal, field in self._segments)
+        query = '&'.join(prefix + urllib.parse.quote_plus(str(encode(kwargs[name])))
+                         for name, prefix, encode in self._query if kwargs.get(name) is not None)
+        return path, '?' + query if query else ''
+
+    def __repr__(self):
+        return f'<Endpoint {self.path}>'
+
+
+def endpoint_table(*endpoints) -> dict:
+    """
+    :return: The endpoints by path template.
+    """
+    return {endpoint.path: endpoint for endpoint in endpoints}
@@ -0,0 +1,58 @@
+from lunarcrush.columns import TimeSeries, series_rows
+
+# pandas and pyarrow are imported by the adapters, only when used
+
+
+def _columns(result) -> TimeSeries:
+    if isinstance(result, TimeSeries):
+        return result
+    if isinstance(result, dict):
+        return TimeSeries.from_rows(series_rows(result), result.get('config'), ints=True)
+    return TimeSeries.from_rows(result, ints=True)
+
+
+def to_pandas(result, index: str = 'time'):
+    """
+    Build a DataFrame from a result, sharing the buffers of the NumPy columns of a :class:`TimeSeries`. The rows of
+    JSON responses are first split into typed columns in one pass.
+
+    :param result: TimeSeries, JSON response (e.g. of ``get_coins_list_v2``) or rows.
+    :param str index: Column of unix timestamps to index the rows with, as UTC datetimes. Ignored if missing.
+    :rtype: pandas.DataFrame
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        raise ImportError('pandas is required by to_pandas: pip install "lunarcrush-v4[pandas]"') from None
+    columns = dict(_columns(result).columns)
+    time = columns.pop(index, None) if index is not None else None
+    frame = pd.DataFrame(columns, copy=False)
+    if time is not None:
+        frame.index = pd.to_datetime(time, unit='s', utc=True).rename(index)
+    return frame
+
+
+def to_arrow(result, nan_as_null: bool = False):
+    """
+    Build an Arrow table from a result. Numeric columns share the buffers of the NumPy columns of a
+    :class:`TimeSeries`, the ``time`` column becomes a UTC timestamp column.
+
+    :param result: TimeSeries, JSON response (e.g. of ``get_coins_list_v2``) or rows.
+    :param bool nan_as_null: Store the missing values as nulls instead of NaN, which copies the float columns.
+    :rtype: pyarrow.Table
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError('pyarrow is required by to_arrow: pip install "lunarcrush-v4[arrow]"') from None
+    series = _columns(result)
+    arrays = []
+    for name, column in series.columns.items():
+        if column.dtype == object:
+            array = pa.array(column.tolist())
+        else:
+            array = pa.array(column, from_pandas=nan_as_null)
+            if name == 'time':
+                array = array.view(pa.timestamp('s', tz='UTC'))
+        arrays.append(array)
+    return pa.Table.from_arrays(arrays, names=series.names)
@@ -0,0 +1,209 @@
+import sqlite3
+import threading
+import time
+
+
+class SymbolIndex:
+    """
+    Local index of the coins, stocks, NFT collections, topics, categories and creators tracked by LunarCrush, stored
+    in a SQLite database and built from the LunarCrushV4 list endpoints. Entries are found by exact or prefix match of
+    their symbol or name, case-insensitively, without any request.
+
+    :meth:`refresh` keeps the index up to date from :meth:`LunarCrushV4.get_system_changes`, requesting only the
+    assets that changed instead of downloading the lists again.
+    """
+
+    # kind -> (id field, symbol field, name field, detail method). The lists are downloaded with
+    # LunarCrushV4.snapshot_universe, paginated or not as declared in the endpoint table.
+    KINDS = {
+        'coins': ('id', 'symbol', 'name', 'get_coin'),
+        'stocks': ('id', 'symbol', 'name', 'get_stock'),
+        'nfts': ('id', 'symbol', 'name', 'get_nft'),
+        'topics': ('topic', 'topic', 'title', None),
+        'categories': ('category', 'category', 'title', None),
+        'creators': ('creator_id', 'creator_name', 'creator_display_name', None),
+    }
+    # asset_type of a system change -> kind
+    _CHANGE_KINDS = {
+        'coin': 'coins', 'coins': 'coins',
+        'stock': 'stocks', 'stocks': 'stocks',
+        'nft': 'nfts', 'nfts': 'nfts',
+    }
+    # change of a system change removing its asset
+    _REMOVALS = ('removed', 'deleted', 'delisted')
+
+    def __init__(self, client, path: str = ':memory:'):
+        """
+        :param LunarCrushV4 client: Client to download the lists with.
+        :param str path: SQLite database file. Defaults to an in-memory database.
+        """
+        self.client = client
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS entries (
+                kind TEXT, id TEXT, symbol TEXT, name TEXT, symbol_key TEXT, name_key TEXT, PRIMARY KEY (kind, id)
+            );
+            CREATE INDEX IF NOT EXISTS entries_symbol ON entries (symbol_key);
+            CREATE INDEX IF NOT EXISTS entries_name ON entries (name_key);
+            CREATE TABLE IF NOT EXISTS synced (kind TEXT PRIMARY KEY, time REAL);
+        ''')
+
+    def close(self):
+        self._db.close()
+
+    def build(self, kinds: list = None):
+        """
+        Download the full lists of ``kinds`` (all of them by default) and replace their entries.
+        """
+        kinds = list(kinds or self.KINDS)
+        # The kinds having a change feed are synced up to its newest change, read before their lists: the changes
+        # made while downloading them are requested again by the next refresh
+        newest = self._newest_change() if any(self.KINDS[kind][3] is not None for kind in kinds) else None
+        for kind in kinds:
+            started = newest if self.KINDS[kind][3] is not None else time.time()
+            rows = list(self._download(kind))
+            with self._lock:
+                self._db.execute('BEGIN')
+                self._db.execute('DELETE FROM entries WHERE kind = ?', (kind,))
+                self._db.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)',
+                                     [self._entry(kind, row) for row in rows])
+                self._db.execute('INSERT OR REPLACE INTO synced VALUES (?, ?)', (kind, started))
+                self._db.execute('COMMIT')
+
+    def refresh(self, kinds: list = None):
+        """
+        Bring the index up to date. Kinds never built are downloaded in full. Coins, stocks and NFTs are updated from
+        the system changes made since their last sync, one request per changed asset. Topics, categories and
+        creators, which have no change feed, are downloaded again.
+
+        An error response, e.g. a rate limit, raises a ValueError and leaves the entries of its kind as they were.
+        """
+        kinds = list(kinds or self.KINDS)
+        synced = self.synced()
+        full = [kind for kind in kinds if kind not in synced or self.KINDS[kind][3] is None]
+        incremental = [kind for kind in kinds if kind not in full]
+        if incremental:
+            # Never cached (see the declaration of /public/system/changes): a stale feed would skip the changes made
+            # since it was served
+            changes = self._data(self.client.get_system_changes())
+            # kind -> {asset id: removed}
+            changed = {kind: {} for kind in incremental}
+            for change in sorted(changes, key=lambda change: change.get('time') or 0):
+                kind = self._CHANGE_KINDS.get(str(change.get('asset_type')).lower())
+                if kind in changed and (change.get('time') or 0) >= synced[kind]:
+                    removed = str(change.get('change')).lower() in self._REMOVALS
+                    changed[kind][change.get('asset_id')] = removed
+            oldest = min((change.get('time') or 0 for change in changes), default=None)
+            newest = self._newest_change(changes)
+            for kind in incremental:
+                if oldest is not None and oldest > synced[kind]:
+                    # The feed does not go back to the last sync, changes may have been missed
+                    full.append(kind)
+                else:
+                    # An empty feed means nothing changed
+                    self._update(kind, changed[kind], max(synced[kind], newest))
+        if full:
+            self.build(full)
+
+    def synced(self) -> dict:
+        """
+        :return: Time of the last sync of every kind built, e.g. ``{'coins': 1700000000.0}``.
+        """
+        with self._lock:
+            return dict(self._db.execute('SELECT kind, time FROM synced').fetchall())
+
+    def lookup(self, term: str, kind: str = None) -> list:
+        """
+        :param str term: Symbol or name to look for, case-insensitive.
+        :param str kind: Only look for entries of this kind, e.g. 'coins'.
+        :return: The entries whose symbol or name is ``term``.
+        """
+        key = term.lower()
+        return self._select('(symbol_key = ? OR name_key = ?)', (key, key), kind, None)
+
+    def search(self, prefix: str, kind: str = None, limit: int = 20) -> list:
+        """
+        :param str prefix: Start of the symbol or name to look for, case-insensitive.
+        :param str kind: Only look for entries of this kind, e.g. 'coins'.
+        :param int limit: Maximum number of entries to return.
+        :return: The entries whose symbol or name starts with ``prefix``, exact matches first.
+        """
+        low = prefix.lower()
+        high = low + '\U0010ffff'
+        return self._select(
+            '((symbol_key >= ? AND symbol_key < ?) OR (name_key >= ? AND name_key < ?))', (low, high, low, high),
+            kind, limit, order=('(symbol_key = ? OR name_key = ?) DESC, symbol_key', (low, low))
+        )
+
+    def get(self, kind: str, asset_id) -> dict:
+        """
+        :return: The entry of ``kind`` with this id, or None.
+        """
+        entries = self._select('id = ?', (str(asset_id),), kind, 1)
+        return entries[0] if entries else None
+
+    def _select(self, where, params, kind, limit, order=None):
+        query = f'SELECT kind, id, symbol, name FROM entries WHERE {where}'
+        if kind is not None:
+            query += ' AND kind = ?'
+            params += (kind,)
+        if order is not None:
+            query += f' ORDER BY {order[0]}'
+            params += order[1]
+        if limit is not None:
+            query += ' LIMIT ?'
+            params += (limit,)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [{'kind': row[0], 'id': row[1], 'symbol': row[2], 'name': row[3]} for row in rows]
+
+    def _newest_change(self, changes: list = None) -> float:
+        # The feed is complete up to its newest change, the next refresh starts from there. This is a time of the
+        # server: the clock of this machine may be ahead of it.
+        if changes is None:
+            changes = self._data(self.client.get_system_changes())
+        return max((change.get('time') or 0 for change in changes), default=0)
+
+    def _download(self, kind):
+        return self.client.snapshot_universe(kind)['rows']
+
+    @staticmethod
+    def _data(response):
+        rows = response.get('data')
+        if rows is None:
+            error = response.get('error')
+            raise ValueError("No 'data' array in the response" + (f': {error}' if error else ''))
+        return rows
+
+    def _update(self, kind, ids, synced):
+        detail = getattr(self.client, self.KINDS[kind][3])
+        upserts, deletes = [], []
+        for asset_id, removed in ids.items():
+            if removed:
+                deletes.append((kind, str(asset_id)))
+                continue
+            response = detail(asset_id)
+            if 'error' in response:
+                # e.g. a rate limit, reported with a 200 status: the entry is kept and the sync time left as it was,
+                # the next refresh requests the changes again
+                raise ValueError(f"Could not refresh {kind} {asset_id}: {response['error']}")
+            data = response.get('data')
+            if data:
+                upserts.append(self._entry(kind, data))
+            else:
+                deletes.append((kind, str(asset_id)))
+        with self._lock:
+            self._db.execute('BEGIN')
+            self._db.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)', upserts)
+            self._db.executemany('DELETE FROM entries WHERE kind = ? AND id = ?', deletes)
+            self._db.execute('INSERT OR REPLACE INTO synced VALUES (?, ?)', (kind, synced))
+            self._db.execute('COMMIT')
+
+    def _entry(self, kind, row):
+        id_field, symbol_field, name_field = self.KINDS[kind][:3]
+        symbol = row.get(symbol_field)
+        name = row.get(name_field)
+        return (kind, str(row.get(id_field)), symbol, name,
+                symbol.lower() if isinstance(symbol, str) else None, name.lower() if isinstance(name, str) else None)
@@ -1,6 +1,5 @@
 import time
 import datetime
-import requests
 import urllib.parse
 from lunarcrush.base import LunarCrushABC
 
@@ -8,8 +7,8 @@ from lunarcrush.base import LunarCrushABC
 class LunarCrush(LunarCrushABC):
     _BASE_URL = 'https://api2.lunarcrush.com/v2'
 
-    def __init__(self, api_key=None):
-        super().__init__(api_key)
+    def __init__(self, api_key=None, **kwargs):
+        super().__init__(api_key, **kwargs)
 
     @staticmethod
     def _parse_kwargs(kwargs):
@@ -26,11 +25,6 @@ class LunarCrush(LunarCrushABC):
         url += '&' + urllib.parse.urlencode(kwargs) if kwargs else ''
         return url
 
-    def _request(self, endpoint, **kwargs):
-        kwargs = self._parse_kwargs(kwargs)
-        url = self._gen_url(endpoint, **kwargs)
-        return requests.get(url).json()
-
     def get_assets(self, symbol: list, **kwargs) -> dict:
         """
         Details, overall metrics, and time series metrics for one or multiple assets.
@@ -51,6 +45,25 @@ class LunarCrush(LunarCrushABC):
         """
         return self._request('assets', symbol=symbol, **kwargs)
 
+    def get_assets_range(self, symbol: str, start: datetime.datetime or int, end: datetime.datetime or int,
+                         interval: str = 'hour', max_workers: int = None, **kwargs) -> dict:
+        """
+        Time series metrics of one asset over an arbitrary range. The range is split into requests of at most 720 data
+        points, fetched concurrently and stitched back into one series.
+
+        :param str symbol: Coin to fetch data for
+        :param datetime.datetime or int start: The start time (datetime or unix timestamp), included.
+        :param datetime.datetime or int end: The end time (datetime or unix timestamp), excluded.
+        :param str interval: Provide an interval string value of either "hour" or "day".
+        :param int max_workers: Number of requests sent at the same time. Defaults to the connection pool size.
+        :key str time_series_indicators: A comma-separated list of metrics to include in the time series values.
+        """
+        return self._fetch_range(
+            lambda first, last, points: self.get_assets([symbol], data_points=points, start=first, interval=interval,
+                                                        **kwargs),
+            start, end, interval, 720, max_workers
+        )
+
     def get_market(self, **kwargs) -> dict:
         """
         Summary information for all supported assets (Markets page) including 5 recent time series values for some metrics.
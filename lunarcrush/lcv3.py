@@ -1,17 +1,94 @@
+import os
+import json
 import time
+import tempfile
 import datetime
-import requests
+import threading
 import urllib.parse
 from lunarcrush.base import LunarCrushABC
+from lunarcrush.cache import _DAY, _HOUR
+from lunarcrush.endpoints import BOOL, TIME, Endpoint, endpoint_table
+
+_SERIES = ('interval', ('start', TIME), 'bucket', 'data_points')
+_INFLUENCERS = ('interval', 'order', 'limit', 'page')
+_INSIGHTS = ('metrics', 'limit', 'volume', 'market_cap', 'alt_rank')
 
 
 class LunarCrushV3(LunarCrushABC):
     _BASE_URL = 'https://lunarcrush.com/api3'
 
-    def __init__(self, api_key):
-        super().__init__(api_key)
-        self.coin_ids = {coin.get('symbol'): coin.get('id') for coin in self.get_coins_list()['data']}
-        self.nft_ids = {nft.get('name'): nft.get('id') for nft in self.get_nfts_list()['data']}
+    ENDPOINTS = endpoint_table(
+        # Coins
+        Endpoint('/coinoftheday'),
+        Endpoint('/coinoftheday/info', ttl=_HOUR),
+        Endpoint('/coins', ('sort', 'limit', ('desc', BOOL))),
+        Endpoint('/coins/{coin}'),
+        Endpoint('/coins/{coin}/change', ('interval',)),
+        Endpoint('/coins/{coin}/historical'),
+        Endpoint('/coins/{coin}/influencers', _INFLUENCERS, paginated=True),
+        Endpoint('/coins/{coin}/insights', ('metrics', 'limit')),
+        Endpoint('/coins/{coin}/meta', ttl=_DAY),
+        Endpoint('/coins/{coin}/time-series', _SERIES),
+        Endpoint('/coins/global'),
+        Endpoint('/coins/global/change', ('interval',)),
+        Endpoint('/coins/global/historical'),
+        Endpoint('/coins/global/insights', ('metrics', 'limit')),
+        Endpoint('/coins/global/time-series', _SERIES),
+        Endpoint('/coins/influencers', _INFLUENCERS, paginated=True),
+        Endpoint('/coins/insights', _INSIGHTS),
+        Endpoint('/coins/list', ttl=_DAY),
+        # Exchanges, feeds, influencers and insights
+        Endpoint('/exchanges', ('order', 'limit')),
+        Endpoint('/exchanges/{exchange}'),
+        Endpoint('/feeds', ('limit', 'since', 'hours', 'days', 'sources', 'coin_id', 'symbol', 'lunar_id', 'market')),
+        Endpoint('/feeds/{feed}'),
+        Endpoint('/influencers/{influencer}', (('fast', BOOL), 'interval', 'sort')),
+        Endpoint('/insights/{insight}', ('type',)),
+        Endpoint('/market-pairs/{coin}', ('limit', 'page', 'sort'), paginated=True),
+        # NFTs
+        Endpoint('/nftoftheday'),
+        Endpoint('/nftoftheday/info', ttl=_HOUR),
+        Endpoint('/nfts', ('sort', 'limit', ('desc', BOOL))),
+        Endpoint('/nft/{nft}'),
+        Endpoint('/nfts/{nft}/change', ('interval',)),
+        Endpoint('/nfts/{nft}/historical'),
+        Endpoint('/nfts/{nft}/influencers', _INFLUENCERS, paginated=True),
+        Endpoint('/nfts/{nft}/insights', ('metrics', 'limit')),
+        Endpoint('/nfts/{nft}/time-series', _SERIES),
+        Endpoint('/nfts/{nft}/tokens', ('sort', 'limit', ('desc', BOOL))),
+        Endpoint('/nfts/global'),
+        Endpoint('/nfts/global/change', ('interval',)),
+        Endpoint('/nfts/global/historical'),
+        Endpoint('/nfts/global/insights', ('metrics', 'limit')),
+        Endpoint('/nfts/global/time-series', _SERIES),
+        Endpoint('/nfts/influencers', _INFLUENCERS, paginated=True),
+        Endpoint('/nfts/insights', _INSIGHTS),
+        Endpoint('/nfts/list', ttl=_DAY),
+        # Opinions, sparks, stats and mentions
+        Endpoint('/opinions', ('context', 'sort')),
+        Endpoint('/opinions/summary'),
+        Endpoint('/sparks/{spark_id}'),
+        Endpoint('/stats/lunrfi'),
+        Endpoint('/top-mentions', ('interval', 'type', 'market')),
+        Endpoint('/whatsup'),
+    )
+    # Id map name -> (list method, key of the items)
+    _ID_MAPS = {'coins': ('get_coins_list', 'symbol'), 'nfts': ('get_nfts_list', 'name')}
+
+    def __init__(self, api_key, ids_path: str = None, ids_max_age: float = 24 * 60 * 60, **kwargs):
+        """
+        The coin and NFT id maps are downloaded on first use only, and refreshed once older than ``ids_max_age``.
+
+        :param str api_key: LunarCrush API key.
+        :param str ids_path: JSON file to persist the id maps to, so that other processes can load them instead of
+                             downloading them. If they can not be downloaded, a stale snapshot is used.
+        :param float ids_max_age: Seconds after which the id maps are downloaded again.
+        """
+        super().__init__(api_key, **kwargs)
+        self._ids_path = ids_path
+        self._ids_max_age = ids_max_age
+        self._ids = {}
+        self._ids_lock = threading.Lock()
 
     @staticmethod
     def _parse_kwargs(kwargs):
@@ -19,9 +96,9 @@ class LunarCrushV3(LunarCrushABC):
         for param, value in kwargs.items():
             if isinstance(value, list):
                 req_params[param] = ','.join(value)
-            if isinstance(value, datetime.datetime):
+            elif isinstance(value, datetime.datetime):
                 req_params[param] = str(int(time.mktime(value.timetuple())))
-            if isinstance(value, bool):
+            elif isinstance(value, bool):
                 req_params[param] = str(value.real)
             elif value is not None:
                 req_params[param] = value
@@ -29,14 +106,101 @@ class LunarCrushV3(LunarCrushABC):
 
     def _gen_url(self, endpoint, **kwargs):
         url = self._BASE_URL + endpoint
-        url += '&' + urllib.parse.urlencode(kwargs) if kwargs else ''
+        url += '?' + urllib.parse.urlencode(kwargs) if kwargs else ''
         return url
 
-    def _request(self, endpoint, **kwargs):
-        kwargs = self._parse_kwargs(kwargs)
-        url = self._gen_url(endpoint, **kwargs)
-        headers = {'Authorization': f'Bearer {self._api_key}'}
-        return requests.get(url, headers=headers).json()
+    def _build_headers(self):
+        return {'Authorization': f'Bearer {self._api_key}'}
+
+    @property
+    def coin_ids(self) -> dict:
+        """
+        Coin symbol -> LunarCrush id.
+        """
+        return self._get_ids('coins')
+
+    @coin_ids.setter
+    def coin_ids(self, ids: dict):
+        self._ids['coins'] = (ids, time.time())
+
+    @property
+    def nft_ids(self) -> dict:
+        """
+        NFT collection name -> LunarCrush id.
+        """
+        return self._get_ids('nfts')
+
+    @nft_ids.setter
+    def nft_ids(self, ids: dict):
+        self._ids['nfts'] = (ids, time.time())
+
+    def refresh_ids(self):
+        """
+        Download the coin and NFT id maps again, and update the snapshot.
+        """
+        for name in self._ID_MAPS:
+            self._set_ids(name, self._download_ids(name))
+
+    def _get_ids(self, name):
+        ids = self._ids.get(name)
+        if ids is None or time.time() - ids[1] >= self._ids_max_age:
+            with self._ids_lock:
+                ids = self._ids.get(name)
+                if ids is None or time.time() - ids[1] >= self._ids_max_age:
+                    ids = self._ids[name] = self._load_ids(name)
+        return ids[0]
+
+    def _load_ids(self, name):
+        snapshot = self._read_ids_snapshot().get(name)
+        if snapshot is not None and time.time() - snapshot['saved'] < self._ids_max_age:
+            return snapshot['ids'], snapshot['saved']
+        try:
+            ids = self._download_ids(name)
+        except Exception:
+            if snapshot is None:
+                raise
+            return snapshot['ids'], time.time()
+        self._write_ids_snapshot(name, ids)
+        return ids, time.time()
+
+    def _download_ids(self, name):
+        method = self._ID_MAPS[name][0]
+        return self._index_ids(name, getattr(self, method)())
+
+    def _index_ids(self, name, response):
+        key = self._ID_MAPS[name][1]
+        return {item.get(key): item.get('id') for item in response['data']}
+
+    def _set_ids(self, name, ids):
+        with self._ids_lock:
+            self._ids[name] = (ids, time.time())
+            self._write_ids_snapshot(name, ids)
+
+    def _read_ids_snapshot(self):
+        if self._ids_path is None:
+            return {}
+        try:
+            with open(self._ids_path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_ids_snapshot(self, name, ids):
+        if self._ids_path is None:
+            return
+        snapshot = self._read_ids_snapshot()
+        snapshot[name] = {'saved': time.time(), 'ids': ids}
+        # A temporary file of its own, in the same directory to be renamed: the processes sharing the snapshot may
+        # write it at the same time
+        directory, base = os.path.split(os.path.abspath(self._ids_path))
+        fd, temp = tempfile.mkstemp(prefix=base + '.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump(snapshot, file)
+            os.replace(temp, self._ids_path)
+        except BaseException:
+            os.remove(temp)
+            raise
 
     def get_coin_id(self, coin):
         return str(self.coin_ids.get(coin))
@@ -85,7 +249,7 @@ class LunarCrushV3(LunarCrushABC):
 
         :param str coin: Pass any value as desc and the output will be reversed (descending).
         """
-        return self._request(f'/coins/{coin}')
+        return self._request('/coins/{coin}', coin=coin)
 
     def get_coin_change(self, coin: str or int, interval: str = '1w') -> dict:
         """
@@ -97,18 +261,45 @@ class LunarCrushV3(LunarCrushABC):
         :param str or int coin: Provide the numeric id or symbol of the coin or token.
         :param str interval: The % change since time interval to use. Options: '1d', '1w', '1m', '3m', '6m', '1y', '2y'.
         """
-        return self._request(f'/coins/{coin}/change', interval=interval)
+        return self._request('/coins/{coin}/change', coin=coin, interval=interval)
 
-    def get_coin_historical(self, coin: str or int) -> dict:
+    def get_coin_historical(self, coin: str or int, as_arrays: bool = False) -> dict:
         """
         Get a full hourly time series data dump for all metrics provided by /coins/:coin/time-series endpoint. It is
         designed to be a cheaper alternative for grabbing full historical data (as opposed to a specified interval) for
         back-testing and modeling. This is usually a > 30mb download and only includes data up to the most recently
         completed day.
 
+        :param str or int coin: Provide the numeric id or symbol of the coin or token.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
+        """
+        response = self._request('/coins/{coin}/historical', coin=coin)
+        return self._time_series(response, as_arrays)
+
+    def iter_coin_historical(self, coin: str or int):
+        """
+        Same data as :meth:`get_coin_historical`, yielded one hourly row at a time as the response is downloaded, so
+        the > 30mb dump is never held in memory at once.
+
         :param str or int coin: Provide the numeric id or symbol of the coin or token.
         """
-        return self._request(f'/coins/{coin}/historical')
+        return self._stream('/coins/{coin}/historical', coin=coin)
+
+    def download_coin_historical(self, coin: str or int, path: str, progress: callable = None,
+                                 checksum: str = 'sha256', compressed: bool = False) -> dict:
+        """
+        Write the response of :meth:`get_coin_historical` to a file as it is downloaded, to parse it later (e.g. with
+        :func:`lunarcrush.streaming.iter_file`) without holding it in memory.
+
+        :param str or int coin: Provide the numeric id or symbol of the coin or token.
+        :param str path: File to write.
+        :param callable progress: Called as ``progress(received, total)`` with the number of bytes received so far and
+                                  the size of the response (None if unknown).
+        :param str checksum: hashlib algorithm of the checksum of the file.
+        :param bool compressed: Keep the file compressed as sent by the server (e.g. gzip).
+        :return: The ``path``, ``size`` in bytes, ``checksum`` and content ``encoding`` of the file.
+        """
+        return self._download('/coins/{coin}/historical', path, progress, checksum, compressed, coin=coin)
 
     def get_coin_influencers(self, coin: str or int, interval: str = '1w', order: str = 'influential',
                              limit: int = 100, page: int = None) -> dict:
@@ -125,7 +316,8 @@ class LunarCrushV3(LunarCrushABC):
         :param int limit: Limit the number of results.
         :param int page: Page number starting at 0.
         """
-        return self._request(f'/coins/{coin}/influencers', interval=interval, order=order, limit=limit, page=page)
+        return self._request('/coins/{coin}/influencers', coin=coin,
+                             interval=interval, order=order, limit=limit, page=page)
 
     def get_coin_insights(self, coin: str or int, metrics: str = None, limit: int = 10) -> dict:
         """
@@ -143,7 +335,7 @@ class LunarCrushV3(LunarCrushABC):
                             'volume', 'market_dominance'.
         :param int limit: Limit the number of results.
         """
-        return self._request(f'/coins/{coin}/insights', metrics=metrics, limit=limit)
+        return self._request('/coins/{coin}/insights', coin=coin, metrics=metrics, limit=limit)
 
     def get_coin_meta(self, coin: str or int) -> dict:
         """
@@ -152,10 +344,10 @@ class LunarCrushV3(LunarCrushABC):
 
         :param str or int coin: Provide the numeric id or symbol of the coin or token.
         """
-        return self._request(f'/coins/{coin}/meta')
+        return self._request('/coins/{coin}/meta', coin=coin)
 
     def get_coin_time_series(self, coin: str or int, interval: str = '1w', start: datetime.datetime = None,
-                             bucket: str = 'hour', data_points: int = None) -> dict:
+                             bucket: str = 'hour', data_points: int = None, as_arrays: bool = False) -> dict:
         """
         Get the same metrics available on the /coins/:coin endpoint in a series of discrete, memorialized time buckets
         (hourly or daily) over a certain time interval beginning at a specified start time. This time series endpoint
@@ -168,10 +360,31 @@ class LunarCrushV3(LunarCrushABC):
         :param datetime.datetime start: The start time (datetime.datetime) to go back to.
         :param str bucket: Use hour or day time buckets / aggregates. Options: 'hour', 'day'.
         :param int data_points: The number of data points to fetch from the start time.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
+        """
+        response = self._request('/coins/{coin}/time-series', coin=coin,
+                                 interval=interval, start=start, bucket=bucket, data_points=data_points)
+        return self._time_series(response, as_arrays)
 
+    def get_coin_time_series_range(self, coin: str or int, start: datetime.datetime or int,
+                                   end: datetime.datetime or int, bucket: str = 'hour',
+                                   max_workers: int = None, as_arrays: bool = False) -> dict:
         """
-        return self._request(f'/coins/{coin}/time-series',
-                             interval=interval, start=start, bucket=bucket, data_points=data_points)
+        Get the time series of a coin over an arbitrary range. The range is split into requests of at most
+        1000 data points, fetched concurrently and stitched back into one series.
+
+        :param str or int coin: Provide the numeric id or symbol of the coin or token.
+        :param datetime.datetime or int start: The start time (datetime or unix timestamp), included.
+        :param datetime.datetime or int end: The end time (datetime or unix timestamp), excluded.
+        :param str bucket: Use hour or day time buckets / aggregates. Options: 'hour', 'day'.
+        :param int max_workers: Number of requests sent at the same time. Defaults to the connection pool size.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
+        """
+        response = self._fetch_range(
+            lambda first, last, points: self.get_coin_time_series(coin, None, first, bucket, points),
+            start, end, bucket, 1000, max_workers
+        )
+        return self._time_series(response, as_arrays)
 
     def get_coins_global(self) -> dict:
         """
@@ -194,12 +407,37 @@ class LunarCrushV3(LunarCrushABC):
         """
         return self._request('/coins/global/change', interval=interval)
 
-    def get_coins_global_historical(self) -> dict:
+    def get_coins_global_historical(self, as_arrays: bool = False) -> dict:
         """
         The full historical hourly time series data for cryptocurrency global metrics. This is usually a > 30mb download
         and only includes data up to the most recently completed day.
+
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
+        """
+        response = self._request('/coins/global/historical')
+        return self._time_series(response, as_arrays)
+
+    def iter_coins_global_historical(self):
+        """
+        Same data as :meth:`get_coins_global_historical`, yielded one hourly row at a time as the response is
+        downloaded.
+        """
+        return self._stream('/coins/global/historical')
+
+    def download_coins_global_historical(self, path: str, progress: callable = None, checksum: str = 'sha256',
+                                         compressed: bool = False) -> dict:
+        """
+        Write the response of :meth:`get_coins_global_historical` to a file as it is downloaded, to parse it later (e.g.
+        with :func:`lunarcrush.streaming.iter_file`) without holding it in memory.
+
+        :param str path: File to write.
+        :param callable progress: Called as ``progress(received, total)`` with the number of bytes received so far and
+                                  the size of the response (None if unknown).
+        :param str checksum: hashlib algorithm of the checksum of the file.
+        :param bool compressed: Keep the file compressed as sent by the server (e.g. gzip).
+        :return: The ``path``, ``size`` in bytes, ``checksum`` and content ``encoding`` of the file.
         """
-        return self._request('/coins/global/historical')
+        return self._download('/coins/global/historical', path, progress, checksum, compressed)
 
     def get_coins_global_insights(self, metrics: str = None, limit: int = 10) -> dict:
         """
@@ -212,7 +450,7 @@ class LunarCrushV3(LunarCrushABC):
         return self._request('/coins/global/insights', metrics=metrics, limit=limit)
 
     def get_coins_global_time_series(self, interval: str = '1w', start: datetime.datetime = None,
-                                     bucket: str = 'hour', data_points: int = None) -> dict:
+                                     bucket: str = 'hour', data_points: int = None, as_arrays: bool = False) -> dict:
         """
         Get the same metrics available on the /coins/global endpoint in a series of discrete, memorialized time buckets
         (hourly or daily) over a certain time interval beginning at a specified start time. This time series endpoint
@@ -224,10 +462,30 @@ class LunarCrushV3(LunarCrushABC):
         :param datetime.datetime start: The start time (datetime.datetime) to go back to.
         :param str bucket: Use hour or day time buckets / aggregates. Options: 'hour', 'day'.
         :param int data_points: The number of data points to fetch from the start time.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
+        """
+        response = self._request('/coins/global/time-series',
+                                 interval=interval, start=start, bucket=bucket, data_points=data_points)
+        return self._time_series(response, as_arrays)
+
+    def get_coins_global_time_series_range(self, start: datetime.datetime or int, end: datetime.datetime or int,
+                                           bucket: str = 'hour', max_workers: int = None,
+                                           as_arrays: bool = False) -> dict:
+        """
+        Get the time series of the global coin metrics over an arbitrary range. The range is split into requests of at
+        most 1000 data points, fetched concurrently and stitched back into one series.
 
+        :param datetime.datetime or int start: The start time (datetime or unix timestamp), included.
+        :param datetime.datetime or int end: The end time (datetime or unix timestamp), excluded.
+        :param str bucket: Use hour or day time buckets / aggregates. Options: 'hour', 'day'.
+        :param int max_workers: Number of requests sent at the same time. Defaults to the connection pool size.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
         """
-        return self._request('/coins/global/time-series',
-                             interval=interval, start=start, bucket=bucket, data_points=data_points)
+        response = self._fetch_range(
+            lambda first, last, points: self.get_coins_global_time_series(None, first, bucket, points),
+            start, end, bucket, 1000, max_workers
+        )
+        return self._time_series(response, as_arrays)
 
     def get_coins_influencers(self, interval: str = '1w', order: str = 'influential',
                               limit: int = 100, page: int = None) -> dict:
@@ -289,7 +547,7 @@ class LunarCrushV3(LunarCrushABC):
 
         :param exchange: The id or lunar id of the exchange.
         """
-        return self._request(f'/exchanges/{exchange}')
+        return self._request('/exchanges/{exchange}', exchange=exchange)
 
     def get_feeds(self, limit: int = 10, since: str = '1m', hours: int = None, days: int = None, sources: str = None,
                   coin_id: int = None, symbol: str = None, lunar_id: int = None, market: str = 'coins') -> dict:
@@ -320,7 +578,7 @@ class LunarCrushV3(LunarCrushABC):
 
         :param str feed: Provide the lunar id of the feed item to get details for, i.e. 'tweets-1559564427413729287'.
         """
-        return self._request(f'/feeds/{feed}')
+        return self._request('/feeds/{feed}', feed=feed)
 
     def get_influencer(self, influencer: str, fast: bool = False, interval: str = None, sort: str = None) -> dict:
         """
@@ -334,7 +592,8 @@ class LunarCrushV3(LunarCrushABC):
         :param str interval: The time interval to get data for. Options: '1d', '1w', '1m', '3m', '6m', '1y', '2y', 'all'.
         :param str sort: Metric to sort the tweets by. Options: 'time'.
         """
-        return self._request(f'/influencers/{influencer}', fast=fast, interval=interval, sort=sort)
+        return self._request('/influencers/{influencer}', influencer=influencer,
+                             fast=fast, interval=interval, sort=sort)
 
     def get_insight(self, insight: str, type_: str = 'coins') -> dict:
         """
@@ -344,7 +603,7 @@ class LunarCrushV3(LunarCrushABC):
                           'influencers'.
         :param str insight: The ID of the insight to fetch details for, i.e. 'D1l133'.
         """
-        return self._request(f'/insights/{insight}', type=type_)
+        return self._request('/insights/{insight}', insight=insight, type=type_)
 
     def get_market_pairs(self, coin: str or int, limit: int = 100, page: int = 100, sort: str = None) -> dict:
         """
@@ -360,7 +619,7 @@ class LunarCrushV3(LunarCrushABC):
         :param sort: Sort the output by a metric. Options: 'name', 'market_sort', 'price', '1d_volume', '30d_volume',
                      'type', 'last_updated'.
         """
-        return self._request(f'/market-pairs/{coin}', limit=limit, page=page, sort=sort)
+        return self._request('/market-pairs/{coin}', coin=coin, limit=limit, page=page, sort=sort)
 
     def get_nft_of_the_day(self) -> dict:
         """
@@ -404,7 +663,7 @@ class LunarCrushV3(LunarCrushABC):
 
         :param nft: Provide the numeric id or lunar id of the NFT collection.
         """
-        return self._request(f'/nft/{nft}')
+        return self._request('/nft/{nft}', nft=nft)
 
     def get_nft_change(self, nft: str or int, interval: str = '1w') -> dict:
         """
@@ -416,9 +675,9 @@ class LunarCrushV3(LunarCrushABC):
         :param nft: Provide the numeric id or lunar id of the NFT.
         :param str interval: The % change since time interval to use. Options: '1d', '1w', '1m', '3m', '6m', '1y', '2y'.
         """
-        return self._request(f'/nfts/{nft}/change', interval=interval)
+        return self._request('/nfts/{nft}/change', nft=nft, interval=interval)
 
-    def get_nft_historical(self, nft: str or int) -> dict:
+    def get_nft_historical(self, nft: str or int, as_arrays: bool = False) -> dict:
         """
         Get a full hourly time series data dump for all metrics provided by /nfts/:nft/time-series endpoint. It is
         designed to be a cheaper alternative for grabbing full historical data (as opposed to a specified interval) for
@@ -426,8 +685,34 @@ class LunarCrushV3(LunarCrushABC):
         completed day.
 
         :param str or int nft: Provide the numeric id or symbol of the NFT or token.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
+        """
+        response = self._request('/nfts/{nft}/historical', nft=nft)
+        return self._time_series(response, as_arrays)
+
+    def iter_nft_historical(self, nft: str or int):
+        """
+        Same data as :meth:`get_nft_historical`, yielded one hourly row at a time as the response is downloaded.
+
+        :param str or int nft: Provide the numeric id or symbol of the NFT or token.
+        """
+        return self._stream('/nfts/{nft}/historical', nft=nft)
+
+    def download_nft_historical(self, nft: str or int, path: str, progress: callable = None,
+                                checksum: str = 'sha256', compressed: bool = False) -> dict:
+        """
+        Write the response of :meth:`get_nft_historical` to a file as it is downloaded, to parse it later (e.g. with
+        :func:`lunarcrush.streaming.iter_file`) without holding it in memory.
+
+        :param str or int nft: Provide the numeric id or symbol of the NFT or token.
+        :param str path: File to write.
+        :param callable progress: Called as ``progress(received, total)`` with the number of bytes received so far and
+                                  the size of the response (None if unknown).
+        :param str checksum: hashlib algorithm of the checksum of the file.
+        :param bool compressed: Keep the file compressed as sent by the server (e.g. gzip).
+        :return: The ``path``, ``size`` in bytes, ``checksum`` and content ``encoding`` of the file.
         """
-        return self._request(f'/nfts/{nft}/historical')
+        return self._download('/nfts/{nft}/historical', path, progress, checksum, compressed, nft=nft)
 
     def get_nft_influencers(self, nft: str or int, interval: str = '1w', order: str = 'influential',
                             limit: int = 100, page: int = None) -> dict:
@@ -444,7 +729,8 @@ class LunarCrushV3(LunarCrushABC):
         :param int limit: Limit the number of results.
         :param int page: Page number starting at 0.
         """
-        return self._request(f'/nfts/{nft}/influencers', interval=interval, order=order, limit=limit, page=page)
+        return self._request('/nfts/{nft}/influencers', nft=nft,
+                             interval=interval, order=order, limit=limit, page=page)
 
     def get_nft_insights(self, nft: str or int, metrics: str = None, limit: int = 10) -> dict:
         """
@@ -460,10 +746,10 @@ class LunarCrushV3(LunarCrushABC):
                             'social_dominance', 'social_contributors', 'market_cap'.
         :param int limit: Limit the number of results.
         """
-        return self._request(f'/nfts/{nft}/insights', metrics=metrics, limit=limit)
+        return self._request('/nfts/{nft}/insights', nft=nft, metrics=metrics, limit=limit)
 
     def get_nft_time_series(self, nft: str or int, interval: str = '1w', start: datetime.datetime = None,
-                            bucket: str = 'hour', data_points: int = None) -> dict:
+                            bucket: str = 'hour', data_points: int = None, as_arrays: bool = False) -> dict:
         """
         Get the same metrics available on the /nfts/:nft endpoint in a series of discrete, memorialized time buckets
         (hourly or daily) over a certain time interval beginning at a specified start time. This time series endpoint
@@ -476,10 +762,11 @@ class LunarCrushV3(LunarCrushABC):
         :param datetime.datetime start: The start time (datetime.datetime) to go back to.
         :param str bucket: Use hour or day time buckets / aggregates. Options: 'hour', 'day'.
         :param int data_points: The number of data points to fetch from the start time.
-
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
         """
-        return self._request(f'/nfts/{nft}/time-series',
-                             interval=interval, start=start, bucket=bucket, data_points=data_points)
+        response = self._request('/nfts/{nft}/time-series', nft=nft,
+                                 interval=interval, start=start, bucket=bucket, data_points=data_points)
+        return self._time_series(response, as_arrays)
 
     def get_nft_tokens(self, nft: str or int, sort: str = 'last_sold_amount',
                        limit: int = 100, desc: bool = False) -> dict:
@@ -495,7 +782,7 @@ class LunarCrushV3(LunarCrushABC):
         :param desc: "True" to reverse the sorted order.
         :return:
         """
-        return self._request(f'/nfts/{nft}/tokens', sort=sort, limit=limit, desc=desc)
+        return self._request('/nfts/{nft}/tokens', nft=nft, sort=sort, limit=limit, desc=desc)
 
     def get_nfts_global(self) -> dict:
         """
@@ -517,12 +804,37 @@ class LunarCrushV3(LunarCrushABC):
         """
         return self._request('/nfts/global/change', interval=interval)
 
-    def get_nfts_global_historical(self) -> dict:
+    def get_nfts_global_historical(self, as_arrays: bool = False) -> dict:
         """
         The full historical hourly time series data for nft global metrics. This is usually a > 10mb download and only
         includes data up to the most recently completed day.
+
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
+        """
+        response = self._request('/nfts/global/historical')
+        return self._time_series(response, as_arrays)
+
+    def iter_nfts_global_historical(self):
         """
-        return self._request('/nfts/global/historical')
+        Same data as :meth:`get_nfts_global_historical`, yielded one hourly row at a time as the response is
+        downloaded.
+        """
+        return self._stream('/nfts/global/historical')
+
+    def download_nfts_global_historical(self, path: str, progress: callable = None, checksum: str = 'sha256',
+                                        compressed: bool = False) -> dict:
+        """
+        Write the response of :meth:`get_nfts_global_historical` to a file as it is downloaded, to parse it later (e.g.
+        with :func:`lunarcrush.streaming.iter_file`) without holding it in memory.
+
+        :param str path: File to write.
+        :param callable progress: Called as ``progress(received, total)`` with the number of bytes received so far and
+                                  the size of the response (None if unknown).
+        :param str checksum: hashlib algorithm of the checksum of the file.
+        :param bool compressed: Keep the file compressed as sent by the server (e.g. gzip).
+        :return: The ``path``, ``size`` in bytes, ``checksum`` and content ``encoding`` of the file.
+        """
+        return self._download('/nfts/global/historical', path, progress, checksum, compressed)
 
     def get_nfts_global_insights(self, metrics: str = None, limit: int = 10) -> dict:
         """
@@ -542,7 +854,7 @@ class LunarCrushV3(LunarCrushABC):
         return self._request('/nfts/global/insights', metrics=metrics, limit=limit)
 
     def get_nfts_global_time_series(self, interval: str = '1w', start: datetime.datetime = None,
-                                    bucket: str = 'hour', data_points: int = None) -> dict:
+                                    bucket: str = 'hour', data_points: int = None, as_arrays: bool = False) -> dict:
         """
         Get the same metrics available on the /nfts/global endpoint in a series of discrete, memorialized time buckets
         (hourly or daily) over a certain time interval beginning at a specified start time. This time series endpoint
@@ -554,10 +866,11 @@ class LunarCrushV3(LunarCrushABC):
         :param datetime.datetime start: The start time (datetime.datetime) to go back to.
         :param str bucket: Use hour or day time buckets / aggregates. Options: 'hour', 'day'.
         :param int data_points: The number of data points to fetch from the start time.
-
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
         """
-        return self._request('/nfts/global/time-series',
-                             interval=interval, start=start, bucket=bucket, data_points=data_points)
+        response = self._request('/nfts/global/time-series',
+                                 interval=interval, start=start, bucket=bucket, data_points=data_points)
+        return self._time_series(response, as_arrays)
 
     def get_nfts_influencers(self, interval: str = '1w', order: str = 'influential',
                              limit: int = 100, page: int = None) -> dict:
@@ -593,7 +906,7 @@ class LunarCrushV3(LunarCrushABC):
         :param float market_cap: Minimum market cap on the NFT to filter by.
         :param int alt_rank: Maximum alt rank on the NFT to filter by.
         """
-        return self._request(f'/nfts/insights',
+        return self._request('/nfts/insights',
                              metrics=metrics, limit=limit, volume=volume, market_cap=market_cap, alt_rank=alt_rank)
 
     def get_nfts_list(self) -> dict:
@@ -627,7 +940,7 @@ class LunarCrushV3(LunarCrushABC):
         :param spark_id: The unique identifier for the spark which is formatted as {context_type}-{context_id}
                          as a single string, i.e. 'feeds-twitter-1544881801687994369'.
         """
-        return self._request(f'/sparks/{spark_id}')
+        return self._request('/sparks/{spark_id}', spark_id=spark_id)
 
     def get_stats_lunrfi(self) -> dict:
         """
@@ -1,15 +1,77 @@
 import time
 import datetime
-import requests
 import urllib.parse
 from lunarcrush.base import LunarCrushABC
+from lunarcrush.cache import _DAY, _MINUTE
+from lunarcrush.endpoints import BOOL, TIME, Endpoint, endpoint_table
+from lunarcrush.records import Coin, Creator, Nft, Stock, Topic
+
+_SERIES = ('bucket', 'interval', ('start', TIME), ('end', TIME))
+_POSTS = (('start', TIME), ('end', TIME))
+_LIST = ('sort', 'filter', 'limit', ('desc', BOOL), 'page')
 
 
 class LunarCrushV4(LunarCrushABC):
     _BASE_URL = 'https://lunarcrush.com/api4'
-
-    def __init__(self, api_key):
-        super().__init__(api_key)
+    _FAMILY_DEPTH = 3
+
+    ENDPOINTS = endpoint_table(
+        # Topics
+        Endpoint('/public/topics/list/v1', ttl=15 * _MINUTE, universe='topics'),
+        Endpoint('/public/topic/{topic}/whatsup/v1'),
+        Endpoint('/public/topic/{topic}/v1'),
+        Endpoint('/public/topic/{topic}/time-series/v2', ('bucket',)),
+        Endpoint('/public/topic/{topic}/time-series/v1', _SERIES),
+        Endpoint('/public/topic/{topic}/posts/v1', _POSTS),
+        Endpoint('/public/topic/{topic}/news/v1'),
+        Endpoint('/public/topic/{topic}/creators/v1'),
+        # Categories
+        Endpoint('/public/category/{category}/v1'),
+        Endpoint('/public/category/{category}/topics/v1'),
+        Endpoint('/public/category/{category}/time-series/v1', _SERIES),
+        Endpoint('/public/category/{category}/posts/v1', _POSTS),
+        Endpoint('/public/category/{category}/news/v1'),
+        Endpoint('/public/category/{category}/creators/v1'),
+        Endpoint('/public/categories/list/v1', ttl=15 * _MINUTE, universe='categories'),
+        # Creators
+        Endpoint('/public/creators/list/v1', ttl=15 * _MINUTE, universe='creators'),
+        Endpoint('/public/creator/{network}/{id}/v1'),
+        Endpoint('/public/creator/{network}/{id}/time-series/v1', _SERIES),
+        Endpoint('/public/creator/{network}/{id}/posts/v1', _POSTS),
+        # Posts
+        Endpoint('/public/posts/{post_type}/{post_id}/v1'),
+        Endpoint('/public/posts/{post_type}/{post_id}/time-series/v1'),
+        # Coins
+        Endpoint('/public/coins/list/v2', _LIST, paginated=True, universe='coins'),
+        Endpoint('/public/coins/list/v1', _LIST, ttl=15 * _MINUTE, paginated=True),
+        Endpoint('/public/coins/{coin}/v1'),
+        Endpoint('/public/coins/{coin}/time-series/v2', _SERIES),
+        Endpoint('/public/coins/{coin}/meta/v1', ttl=_DAY),
+        # Stocks
+        Endpoint('/public/stocks/list/v2', _LIST, paginated=True, universe='stocks'),
+        Endpoint('/public/stocks/list/v1', _LIST, ttl=15 * _MINUTE, paginated=True),
+        Endpoint('/public/stocks/{stock}/v1'),
+        Endpoint('/public/stocks/{stock}/time-series/v2', _SERIES),
+        # NFTs
+        Endpoint('/public/nfts/list/v2', _LIST, paginated=True, universe='nfts'),
+        Endpoint('/public/nfts/list/v1', _LIST, ttl=15 * _MINUTE, paginated=True),
+        Endpoint('/public/nfts/{nft}/v1'),
+        Endpoint('/public/nfts/{nft}/time-series/v2', ('bucket',)),
+        Endpoint('/public/nfts/{nft}/time-series/v1', _SERIES),
+        # Searches, created, updated and deleted with GET requests too
+        Endpoint('/public/searches/search', ('term', 'search_json')),
+        Endpoint('/public/searches/list'),
+        Endpoint('/public/searches/create', ('name', 'search_json', ('priority', BOOL)), idempotent=False),
+        Endpoint('/public/searches/{slug}/update', ('name', 'search_json'), idempotent=False),
+        Endpoint('/public/searches/{slug}/delete', idempotent=False),
+        Endpoint('/public/searches/{slug}'),
+        # System
+        # Never cached: SymbolIndex.refresh takes its sync time from the feed, a stale one would miss changes
+        Endpoint('/public/system/changes', ttl=0),
+    )
+
+    def __init__(self, api_key, **kwargs):
+        super().__init__(api_key, **kwargs)
 
     @staticmethod
     def _parse_kwargs(kwargs):
@@ -31,18 +93,18 @@ class LunarCrushV4(LunarCrushABC):
             url += '?' + urllib.parse.urlencode(kwargs)
         return url
 
-    def _request(self, endpoint, **kwargs):
-        kwargs = self._parse_kwargs(kwargs)
-        url = self._gen_url(endpoint, **kwargs)
-        headers = {'Authorization': f'Bearer {self._api_key}'}
-        return requests.get(url, headers=headers).json()
+    def _build_headers(self):
+        return {'Authorization': f'Bearer {self._api_key}'}
 
     # Topics endpoints
-    def get_topics_list(self) -> dict:
+    def get_topics_list(self, as_records: bool = False) -> dict:
         """
         Get a list of trending social topics.
+
+        :param bool as_records: Return a list of :class:`Topic` records instead of the JSON response.
         """
-        return self._request('/public/topics/list/v1')
+        response = self._request('/public/topics/list/v1')
+        return self._records(response, Topic, as_records)
 
     def get_topic_whatsup(self, topic: str) -> dict:
         """
@@ -51,7 +113,7 @@ class LunarCrushV4(LunarCrushABC):
         :param str topic: Provide the topic to get a summary for. A topic must be all lower case and can only include
                           letters, numbers, spaces, # and $.
         """
-        return self._request(f'/public/topic/{topic}/whatsup/v1')
+        return self._request('/public/topic/{topic}/whatsup/v1', topic=topic)
 
     def get_topic(self, topic: str) -> dict:
         """
@@ -62,9 +124,9 @@ class LunarCrushV4(LunarCrushABC):
                           letters, numbers, spaces, # and $. You can also look up a topic by the coin/nft/stock
                           numeric id like coins:1 for bitcoin or stocks:7056 for nVidia.
         """
-        return self._request(f'/public/topic/{topic}/v1')
+        return self._request('/public/topic/{topic}/v1', topic=topic)
 
-    def get_topic_time_series_v2(self, topic: str, bucket: str = None) -> dict:
+    def get_topic_time_series_v2(self, topic: str, bucket: str = None, as_arrays: bool = False) -> dict:
         """
         Get historical time series data for a social topic.
 
@@ -73,11 +135,14 @@ class LunarCrushV4(LunarCrushABC):
         :param str bucket: Leave blank (default) for the most week aggregated by hour, specify hour for full historical
                            data available in hourly aggregation, specify day for full historical data available in
                            daily aggregation.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
         """
-        return self._request(f'/public/topic/{topic}/time-series/v2', bucket=bucket)
+        response = self._request('/public/topic/{topic}/time-series/v2', topic=topic, bucket=bucket)
+        return self._time_series(response, as_arrays)
 
     def get_topic_time_series(self, topic: str, bucket: str = None, interval: str = None,
-                              start: datetime.datetime = None, end: datetime.datetime = None) -> dict:
+                              start: datetime.datetime = None, end: datetime.datetime = None,
+                              as_arrays: bool = False) -> dict:
         """
         Get historical time series data for a social topic.
 
@@ -88,9 +153,32 @@ class LunarCrushV4(LunarCrushABC):
                              If "start" or "end" parameters are provided this parameter is ignored.
         :param datetime.datetime start: The start time (unix timestamp) to go back to.
         :param datetime.datetime end: The end time (unix timestamp) to stop at.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
+        """
+        response = self._request('/public/topic/{topic}/time-series/v1', topic=topic,
+                                 bucket=bucket, interval=interval, start=start, end=end)
+        return self._time_series(response, as_arrays)
+
+    def get_topic_time_series_range(self, topic: str, start: datetime.datetime or int,
+                                    end: datetime.datetime or int, bucket: str = 'hour', chunk_points: int = 720,
+                                    max_workers: int = None, as_arrays: bool = False) -> dict:
+        """
+        Get the time series of a topic over an arbitrary range. The range is split into requests of at most
+        ``chunk_points`` buckets, fetched concurrently and stitched back into one series.
+
+        :param str topic: Provide the topic to get details for, all lower case.
+        :param datetime.datetime or int start: The start time (datetime or unix timestamp), included.
+        :param datetime.datetime or int end: The end time (datetime or unix timestamp), excluded.
+        :param str bucket: bucket time series data into hours or days. default is hours.
+        :param int chunk_points: Maximum number of buckets per request.
+        :param int max_workers: Number of requests sent at the same time. Defaults to the connection pool size.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
         """
-        return self._request(f'/public/topic/{topic}/time-series/v1',
-                             bucket=bucket, interval=interval, start=start, end=end)
+        response = self._fetch_range(
+            lambda first, last, points: self.get_topic_time_series(topic, bucket, None, first, last),
+            start, end, bucket, chunk_points, max_workers
+        )
+        return self._time_series(response, as_arrays)
 
     def get_topic_posts(self, topic: str, start: datetime.datetime = None, end: datetime.datetime = None) -> dict:
         """
@@ -106,7 +194,7 @@ class LunarCrushV4(LunarCrushABC):
         :param datetime.datetime end: (Optional) The end time (unix timestamp) to stop at. Will be rounded to the end
                                       of the day.
         """
-        return self._request(f'/public/topic/{topic}/posts/v1', start=start, end=end)
+        return self._request('/public/topic/{topic}/posts/v1', topic=topic, start=start, end=end)
 
     def get_topic_news(self, topic: str) -> dict:
         """
@@ -116,7 +204,7 @@ class LunarCrushV4(LunarCrushABC):
         :param str topic: Provide the topic to get details for. A topic must be all lower case and can only include
                           letters, numbers, spaces, # and $.
         """
-        return self._request(f'/public/topic/{topic}/news/v1')
+        return self._request('/public/topic/{topic}/news/v1', topic=topic)
 
     def get_topic_creators(self, topic: str) -> dict:
         """
@@ -125,7 +213,7 @@ class LunarCrushV4(LunarCrushABC):
         :param str topic: Provide the topic to get details for. A topic must be all lower case and can only include
                           letters, numbers, spaces, # and $.
         """
-        return self._request(f'/public/topic/{topic}/creators/v1')
+        return self._request('/public/topic/{topic}/creators/v1', topic=topic)
 
     # Categories endpoints
     def get_category(self, category: str) -> dict:
@@ -136,7 +224,7 @@ class LunarCrushV4(LunarCrushABC):
                              include letters, numbers, and spaces. A category is the aggregation of all posts for all
                              topics within the category.
         """
-        return self._request(f'/public/category/{category}/v1')
+        return self._request('/public/category/{category}/v1', category=category)
 
     def get_category_topics(self, category: str) -> dict:
         """
@@ -145,10 +233,11 @@ class LunarCrushV4(LunarCrushABC):
         :param str category: Provide the topic to get details for. A topic must be all lower case and can only include
                              letters, numbers, spaces, # and $.
         """
-        return self._request(f'/public/category/{category}/topics/v1')
+        return self._request('/public/category/{category}/topics/v1', category=category)
 
     def get_category_time_series(self, category: str, bucket: str = None, interval: str = None,
-                                  start: datetime.datetime = None, end: datetime.datetime = None) -> dict:
+                                  start: datetime.datetime = None, end: datetime.datetime = None,
+                                  as_arrays: bool = False) -> dict:
         """
         Get historical time series data for a social category.
 
@@ -159,9 +248,32 @@ class LunarCrushV4(LunarCrushABC):
                              If "start" or "end" parameters are provided this parameter is ignored.
         :param datetime.datetime start: The start time (unix timestamp) to go back to.
         :param datetime.datetime end: The end time (unix timestamp) to stop at.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
         """
-        return self._request(f'/public/category/{category}/time-series/v1',
-                             bucket=bucket, interval=interval, start=start, end=end)
+        response = self._request('/public/category/{category}/time-series/v1', category=category,
+                                 bucket=bucket, interval=interval, start=start, end=end)
+        return self._time_series(response, as_arrays)
+
+    def get_category_time_series_range(self, category: str, start: datetime.datetime or int,
+                                       end: datetime.datetime or int, bucket: str = 'hour', chunk_points: int = 720,
+                                       max_workers: int = None, as_arrays: bool = False) -> dict:
+        """
+        Get the time series of a category over an arbitrary range. The range is split into requests of at most
+        ``chunk_points`` buckets, fetched concurrently and stitched back into one series.
+
+        :param str category: Provide the category to get details for, all lower case.
+        :param datetime.datetime or int start: The start time (datetime or unix timestamp), included.
+        :param datetime.datetime or int end: The end time (datetime or unix timestamp), excluded.
+        :param str bucket: bucket time series data into hours or days. default is hours.
+        :param int chunk_points: Maximum number of buckets per request.
+        :param int max_workers: Number of requests sent at the same time. Defaults to the connection pool size.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
+        """
+        response = self._fetch_range(
+            lambda first, last, points: self.get_category_time_series(category, bucket, None, first, last),
+            start, end, bucket, chunk_points, max_workers
+        )
+        return self._time_series(response, as_arrays)
 
     def get_category_posts(self, category: str, start: datetime.datetime = None, end: datetime.datetime = None) -> dict:
         """
@@ -177,7 +289,7 @@ class LunarCrushV4(LunarCrushABC):
         :param datetime.datetime end: (Optional) The end time (unix timestamp) to stop at. Will be rounded to the end
                                       of the day.
         """
-        return self._request(f'/public/category/{category}/posts/v1', start=start, end=end)
+        return self._request('/public/category/{category}/posts/v1', category=category, start=start, end=end)
 
     def get_category_news(self, category: str) -> dict:
         """
@@ -187,7 +299,7 @@ class LunarCrushV4(LunarCrushABC):
         :param str category: Provide the category to get details for. A category must be all lower case and can only
                              include letters, numbers, and spaces.
         """
-        return self._request(f'/public/category/{category}/news/v1')
+        return self._request('/public/category/{category}/news/v1', category=category)
 
     def get_category_creators(self, category: str) -> dict:
         """
@@ -196,7 +308,7 @@ class LunarCrushV4(LunarCrushABC):
         :param str category: Provide the category to get details for. A category must be all lower case and can only
                              include letters, numbers, and spaces.
         """
-        return self._request(f'/public/category/{category}/creators/v1')
+        return self._request('/public/category/{category}/creators/v1', category=category)
 
     def get_categories_list(self) -> dict:
         """
@@ -205,12 +317,15 @@ class LunarCrushV4(LunarCrushABC):
         return self._request('/public/categories/list/v1')
 
     # Creators endpoints
-    def get_creators_list(self) -> dict:
+    def get_creators_list(self, as_records: bool = False) -> dict:
         """
         Get a list of trending social creators over all of social based on interactions. To get lists of creators by
         category or topic see the topics and categories endpoints.
+
+        :param bool as_records: Return a list of :class:`Creator` records instead of the JSON response.
         """
-        return self._request('/public/creators/list/v1')
+        response = self._request('/public/creators/list/v1')
+        return self._records(response, Creator, as_records)
 
     def get_creator(self, network: str, id: str) -> dict:
         """
@@ -219,10 +334,11 @@ class LunarCrushV4(LunarCrushABC):
         :param str network: Provide the network for the creator. One of twitter, youtube, instagram, reddit, or tiktok
         :param str id: Provide the unique ID or screen name of the creator
         """
-        return self._request(f'/public/creator/{network}/{id}/v1')
+        return self._request('/public/creator/{network}/{id}/v1', network=network, id=id)
 
     def get_creator_time_series(self, network: str, id: str, bucket: str = None, interval: str = None,
-                                start: datetime.datetime = None, end: datetime.datetime = None) -> dict:
+                                start: datetime.datetime = None, end: datetime.datetime = None,
+                                as_arrays: bool = False) -> dict:
         """
         Get time series data on a creator.
 
@@ -233,9 +349,33 @@ class LunarCrushV4(LunarCrushABC):
                              If "start" or "end" parameters are provided this parameter is ignored.
         :param datetime.datetime start: The start time (unix timestamp) to go back to.
         :param datetime.datetime end: The end time (unix timestamp) to stop at.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
+        """
+        response = self._request('/public/creator/{network}/{id}/time-series/v1', network=network, id=id,
+                                 bucket=bucket, interval=interval, start=start, end=end)
+        return self._time_series(response, as_arrays)
+
+    def get_creator_time_series_range(self, network: str, id: str, start: datetime.datetime or int,
+                                      end: datetime.datetime or int, bucket: str = 'hour', chunk_points: int = 720,
+                                      max_workers: int = None, as_arrays: bool = False) -> dict:
         """
-        return self._request(f'/public/creator/{network}/{id}/time-series/v1',
-                             bucket=bucket, interval=interval, start=start, end=end)
+        Get the time series of a creator over an arbitrary range. The range is split into requests of at most
+        ``chunk_points`` buckets, fetched concurrently and stitched back into one series.
+
+        :param str network: Influencer social network
+        :param str id: The unique id or screen name of the creator
+        :param datetime.datetime or int start: The start time (datetime or unix timestamp), included.
+        :param datetime.datetime or int end: The end time (datetime or unix timestamp), excluded.
+        :param str bucket: bucket time series data into hours or days. default is hours.
+        :param int chunk_points: Maximum number of buckets per request.
+        :param int max_workers: Number of requests sent at the same time. Defaults to the connection pool size.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
+        """
+        response = self._fetch_range(
+            lambda first, last, points: self.get_creator_time_series(network, id, bucket, None, first, last),
+            start, end, bucket, chunk_points, max_workers
+        )
+        return self._time_series(response, as_arrays)
 
     def get_creator_posts(self, network: str, id: str, start: datetime.datetime = None,
                           end: datetime.datetime = None) -> dict:
@@ -250,7 +390,7 @@ class LunarCrushV4(LunarCrushABC):
         :param datetime.datetime end: (Optional) The end time (unix timestamp) to stop at. Will be rounded to the end
                                       of the day.
         """
-        return self._request(f'/public/creator/{network}/{id}/posts/v1', start=start, end=end)
+        return self._request('/public/creator/{network}/{id}/posts/v1', network=network, id=id, start=start, end=end)
 
     # Posts endpoints
     def get_post(self, post_type: str, post_id: str) -> dict:
@@ -261,9 +401,9 @@ class LunarCrushV4(LunarCrushABC):
         :param str post_id: The unique id of a post, for twitter it is a number, youtube it is the id in the url
                             after watch?v=, look in the url for the unique id
         """
-        return self._request(f'/public/posts/{post_type}/{post_id}/v1')
+        return self._request('/public/posts/{post_type}/{post_id}/v1', post_type=post_type, post_id=post_id)
 
-    def get_post_time_series(self, post_type: str, post_id: str) -> dict:
+    def get_post_time_series(self, post_type: str, post_id: str, as_arrays: bool = False) -> dict:
         """
         Get interactions over time for a post. If a post is older than 365 days the time series will be returned as
         daily interactions, otherwise it hourly interactions.
@@ -271,12 +411,15 @@ class LunarCrushV4(LunarCrushABC):
         :param str post_type: The post type e.g. tweet, youtube-video, tiktok-video, reddit-post, instagram-post
         :param str post_id: The unique id of a post, for twitter it is a number, youtube it is the id in the url
                             after watch?v=, look in the url for the unique id
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
         """
-        return self._request(f'/public/posts/{post_type}/{post_id}/time-series/v1')
+        response = self._request('/public/posts/{post_type}/{post_id}/time-series/v1',
+                                 post_type=post_type, post_id=post_id)
+        return self._time_series(response, as_arrays)
 
     # Coins endpoints
     def get_coins_list_v2(self, sort: str = None, filter: str = None, limit: int = None,
-                          desc: bool = None, page: int = None) -> dict:
+                          desc: bool = None, page: int = None, as_records: bool = False) -> dict:
         """
         Get a general snapshot of LunarCrush metrics on the entire list of tracked coins. It is designed as a
         lightweight mechanism for monitoring the universe of available assets, either in aggregate or relative to each
@@ -290,11 +433,13 @@ class LunarCrushV4(LunarCrushABC):
         :param int limit: limit the number of results. Default is 10 maximum is 1000 per page.
         :param bool desc: Pass any value as desc and the output will be reversed (descending)
         :param int page: When using limit, set the page of results to display, pages start at 0
+        :param bool as_records: Return a list of :class:`Coin` records instead of the JSON response.
         """
-        return self._request('/public/coins/list/v2', sort=sort, filter=filter, limit=limit, desc=desc, page=page)
+        response = self._request('/public/coins/list/v2', sort=sort, filter=filter, limit=limit, desc=desc, page=page)
+        return self._records(response, Coin, as_records)
 
     def get_coins_list(self, sort: str = None, filter: str = None, limit: int = None,
-                       desc: bool = None, page: int = None) -> dict:
+                       desc: bool = None, page: int = None, as_records: bool = False) -> dict:
         """
         Get a general snapshot of LunarCrush metrics on the entire list of tracked coins. This version is heavily
         cached and up to 1 hour behind. It is designed as a lightweight mechanism for monitoring the universe of
@@ -308,8 +453,25 @@ class LunarCrushV4(LunarCrushABC):
         :param int limit: limit the number of results. Default is 10 maximum is 1000 per page.
         :param bool desc: Pass any value as desc and the output will be reversed (descending)
         :param int page: When using limit, set the page of results to display, pages start at 0
+        :param bool as_records: Return a list of :class:`Coin` records instead of the JSON response.
+        """
+        response = self._request('/public/coins/list/v1', sort=sort, filter=filter, limit=limit, desc=desc, page=page)
+        return self._records(response, Coin, as_records)
+
+    def iter_coins_list(self, sort: str = None, filter: str = None, desc: bool = None, page_size: int = 1000,
+                         prefetch: int = 2):
         """
-        return self._request('/public/coins/list/v1', sort=sort, filter=filter, limit=limit, desc=desc, page=page)
+        Iterate over the whole list of tracked coins of :meth:`get_coins_list_v2`, page after page. The next pages are
+        requested in the background while the current one is consumed. Stop iterating to stop requesting pages,
+        e.g. with ``itertools.islice``.
+
+        :param str sort: sort the output by metric
+        :param str filter: filter by sub categories / sector from the "categories" key
+        :param bool desc: Pass any value as desc and the output will be reversed (descending)
+        :param int page_size: Rows requested per page, maximum 1000.
+        :param int prefetch: Number of pages requested ahead of the one being consumed.
+        """
+        return self._paginate('/public/coins/list/v2', page_size, prefetch, sort=sort, filter=filter, desc=desc)
 
     def get_coin(self, coin: str or int) -> dict:
         """
@@ -318,10 +480,11 @@ class LunarCrushV4(LunarCrushABC):
 
         :param str or int coin: provide the numeric id or symbol of the coin or token.
         """
-        return self._request(f'/public/coins/{coin}/v1')
+        return self._request('/public/coins/{coin}/v1', coin=coin)
 
     def get_coin_time_series(self, coin: str or int, bucket: str = None, interval: str = None,
-                             start: datetime.datetime = None, end: datetime.datetime = None) -> dict:
+                             start: datetime.datetime = None, end: datetime.datetime = None,
+                             as_arrays: bool = False) -> dict:
         """
         Get market time series data on a coin or token. Specify the coin to be queried by providing the numeric ID or
         the symbol of the coin in the input parameter, which can be found by calling the /coins/list endpoint.
@@ -332,9 +495,32 @@ class LunarCrushV4(LunarCrushABC):
                              If "start" or "end" parameters are provided this parameter is ignored.
         :param datetime.datetime start: The start time (unix timestamp) to go back to.
         :param datetime.datetime end: The end time (unix timestamp) to stop at.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
+        """
+        response = self._request('/public/coins/{coin}/time-series/v2', coin=coin,
+                                 bucket=bucket, interval=interval, start=start, end=end)
+        return self._time_series(response, as_arrays)
+
+    def get_coin_time_series_range(self, coin: str or int, start: datetime.datetime or int,
+                                   end: datetime.datetime or int, bucket: str = 'hour', chunk_points: int = 720,
+                                   max_workers: int = None, as_arrays: bool = False) -> dict:
+        """
+        Get the time series of a coin over an arbitrary range. The range is split into requests of at most
+        ``chunk_points`` buckets, fetched concurrently and stitched back into one series.
+
+        :param str or int coin: provide the numeric id or symbol of the coin or token.
+        :param datetime.datetime or int start: The start time (datetime or unix timestamp), included.
+        :param datetime.datetime or int end: The end time (datetime or unix timestamp), excluded.
+        :param str bucket: bucket time series data into hours or days. default is hours.
+        :param int chunk_points: Maximum number of buckets per request.
+        :param int max_workers: Number of requests sent at the same time. Defaults to the connection pool size.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
         """
-        return self._request(f'/public/coins/{coin}/time-series/v2',
-                             bucket=bucket, interval=interval, start=start, end=end)
+        response = self._fetch_range(
+            lambda first, last, points: self.get_coin_time_series(coin, bucket, None, first, last),
+            start, end, bucket, chunk_points, max_workers
+        )
+        return self._time_series(response, as_arrays)
 
     def get_coin_meta(self, coin: str or int) -> dict:
         """
@@ -343,11 +529,11 @@ class LunarCrushV4(LunarCrushABC):
 
         :param str or int coin: provide the numeric id or symbol of the coin or token.
         """
-        return self._request(f'/public/coins/{coin}/meta/v1')
+        return self._request('/public/coins/{coin}/meta/v1', coin=coin)
 
     # Stocks endpoints
     def get_stocks_list_v2(self, sort: str = None, filter: str = None, limit: int = None,
-                           desc: bool = None, page: int = None) -> dict:
+                           desc: bool = None, page: int = None, as_records: bool = False) -> dict:
         """
         Get a general snapshot of LunarCrush metrics on the entire list of tracked stocks. It is designed as a
         lightweight mechanism for monitoring the universe of available assets.
@@ -358,11 +544,13 @@ class LunarCrushV4(LunarCrushABC):
         :param int limit: limit the number of results. Default is 10 maximum is 1000 per page.
         :param bool desc: Pass any value as desc and the output will be reversed (descending)
         :param int page: When using limit, set the page of results to display, pages start at 0
+        :param bool as_records: Return a list of :class:`Stock` records instead of the JSON response.
         """
-        return self._request('/public/stocks/list/v2', sort=sort, filter=filter, limit=limit, desc=desc, page=page)
+        response = self._request('/public/stocks/list/v2', sort=sort, filter=filter, limit=limit, desc=desc, page=page)
+        return self._records(response, Stock, as_records)
 
     def get_stocks_list(self, sort: str = None, filter: str = None, limit: int = None,
-                        desc: bool = None, page: int = None) -> dict:
+                        desc: bool = None, page: int = None, as_records: bool = False) -> dict:
         """
         Get a general snapshot of LunarCrush metrics on the entire list of tracked stocks. This version is heavily
         cached and up to 1 hour behind.
@@ -373,8 +561,25 @@ class LunarCrushV4(LunarCrushABC):
         :param int limit: limit the number of results. Default is 10 maximum is 1000 per page.
         :param bool desc: Pass any value as desc and the output will be reversed (descending)
         :param int page: When using limit, set the page of results to display, pages start at 0
+        :param bool as_records: Return a list of :class:`Stock` records instead of the JSON response.
+        """
+        response = self._request('/public/stocks/list/v1', sort=sort, filter=filter, limit=limit, desc=desc, page=page)
+        return self._records(response, Stock, as_records)
+
+    def iter_stocks_list(self, sort: str = None, filter: str = None, desc: bool = None, page_size: int = 1000,
+                          prefetch: int = 2):
+        """
+        Iterate over the whole list of tracked stocks of :meth:`get_stocks_list_v2`, page after page. The next pages are
+        requested in the background while the current one is consumed. Stop iterating to stop requesting pages,
+        e.g. with ``itertools.islice``.
+
+        :param str sort: sort the output by metric
+        :param str filter: filter by sub categories / sector from the "categories" key
+        :param bool desc: Pass any value as desc and the output will be reversed (descending)
+        :param int page_size: Rows requested per page, maximum 1000.
+        :param int prefetch: Number of pages requested ahead of the one being consumed.
         """
-        return self._request('/public/stocks/list/v1', sort=sort, filter=filter, limit=limit, desc=desc, page=page)
+        return self._paginate('/public/stocks/list/v2', page_size, prefetch, sort=sort, filter=filter, desc=desc)
 
     def get_stock(self, stock: str or int) -> dict:
         """
@@ -383,10 +588,11 @@ class LunarCrushV4(LunarCrushABC):
 
         :param str or int stock: provide the numeric id or symbol of the stock.
         """
-        return self._request(f'/public/stocks/{stock}/v1')
+        return self._request('/public/stocks/{stock}/v1', stock=stock)
 
     def get_stock_time_series(self, stock: str or int, bucket: str = None, interval: str = None,
-                              start: datetime.datetime = None, end: datetime.datetime = None) -> dict:
+                              start: datetime.datetime = None, end: datetime.datetime = None,
+                              as_arrays: bool = False) -> dict:
         """
         Get market time series data on a stock.
 
@@ -396,13 +602,36 @@ class LunarCrushV4(LunarCrushABC):
                              If "start" or "end" parameters are provided this parameter is ignored.
         :param datetime.datetime start: The start time (unix timestamp) to go back to.
         :param datetime.datetime end: The end time (unix timestamp) to stop at.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
         """
-        return self._request(f'/public/stocks/{stock}/time-series/v2',
-                             bucket=bucket, interval=interval, start=start, end=end)
+        response = self._request('/public/stocks/{stock}/time-series/v2', stock=stock,
+                                 bucket=bucket, interval=interval, start=start, end=end)
+        return self._time_series(response, as_arrays)
+
+    def get_stock_time_series_range(self, stock: str or int, start: datetime.datetime or int,
+                                    end: datetime.datetime or int, bucket: str = 'hour', chunk_points: int = 720,
+                                    max_workers: int = None, as_arrays: bool = False) -> dict:
+        """
+        Get the time series of a stock over an arbitrary range. The range is split into requests of at most
+        ``chunk_points`` buckets, fetched concurrently and stitched back into one series.
+
+        :param str or int stock: provide the numeric id or symbol of the stock.
+        :param datetime.datetime or int start: The start time (datetime or unix timestamp), included.
+        :param datetime.datetime or int end: The end time (datetime or unix timestamp), excluded.
+        :param str bucket: bucket time series data into hours or days. default is hours.
+        :param int chunk_points: Maximum number of buckets per request.
+        :param int max_workers: Number of requests sent at the same time. Defaults to the connection pool size.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
+        """
+        response = self._fetch_range(
+            lambda first, last, points: self.get_stock_time_series(stock, bucket, None, first, last),
+            start, end, bucket, chunk_points, max_workers
+        )
+        return self._time_series(response, as_arrays)
 
     # NFTs endpoints
     def get_nfts_list_v2(self, sort: str = None, filter: str = None, limit: int = None,
-                         desc: bool = None, page: int = None) -> dict:
+                         desc: bool = None, page: int = None, as_records: bool = False) -> dict:
         """
         Get a general snapshot of LunarCrush metrics on the entire list of tracked NFT collections.
 
@@ -412,11 +641,13 @@ class LunarCrushV4(LunarCrushABC):
         :param int limit: limit the number of results. Default is 10 maximum is 1000 per page.
         :param bool desc: Pass any value as desc and the output will be reversed (descending)
         :param int page: When using limit, set the page of results to display, pages start at 0
+        :param bool as_records: Return a list of :class:`Nft` records instead of the JSON response.
         """
-        return self._request('/public/nfts/list/v2', sort=sort, filter=filter, limit=limit, desc=desc, page=page)
+        response = self._request('/public/nfts/list/v2', sort=sort, filter=filter, limit=limit, desc=desc, page=page)
+        return self._records(response, Nft, as_records)
 
     def get_nfts_list(self, sort: str = None, filter: str = None, limit: int = None,
-                      desc: bool = None, page: int = None) -> dict:
+                      desc: bool = None, page: int = None, as_records: bool = False) -> dict:
         """
         Get a general snapshot of LunarCrush metrics on the entire list of tracked NFT collections. This version is
         heavily cached and up to 1 hour behind.
@@ -427,8 +658,25 @@ class LunarCrushV4(LunarCrushABC):
         :param int limit: limit the number of results. Default is 10 maximum is 1000 per page.
         :param bool desc: Pass any value as desc and the output will be reversed (descending)
         :param int page: When using limit, set the page of results to display, pages start at 0
+        :param bool as_records: Return a list of :class:`Nft` records instead of the JSON response.
+        """
+        response = self._request('/public/nfts/list/v1', sort=sort, filter=filter, limit=limit, desc=desc, page=page)
+        return self._records(response, Nft, as_records)
+
+    def iter_nfts_list(self, sort: str = None, filter: str = None, desc: bool = None, page_size: int = 1000,
+                        prefetch: int = 2):
         """
-        return self._request('/public/nfts/list/v1', sort=sort, filter=filter, limit=limit, desc=desc, page=page)
+        Iterate over the whole list of tracked NFT collections of :meth:`get_nfts_list_v2`, page after page. The next
+        pages are requested in the background while the current one is consumed. Stop iterating to stop requesting
+        pages, e.g. with ``itertools.islice``.
+
+        :param str sort: sort the output by metric
+        :param str filter: filter by sub categories / sector from the "categories" key
+        :param bool desc: Pass any value as desc and the output will be reversed (descending)
+        :param int page_size: Rows requested per page, maximum 1000.
+        :param int prefetch: Number of pages requested ahead of the one being consumed.
+        """
+        return self._paginate('/public/nfts/list/v2', page_size, prefetch, sort=sort, filter=filter, desc=desc)
 
     def get_nft(self, nft: str or int) -> dict:
         """
@@ -436,9 +684,9 @@ class LunarCrushV4(LunarCrushABC):
 
         :param str or int nft: provide the numeric id or symbol of the NFT collection.
         """
-        return self._request(f'/public/nfts/{nft}/v1')
+        return self._request('/public/nfts/{nft}/v1', nft=nft)
 
-    def get_nft_time_series_v2(self, nft: str or int, bucket: str = None) -> dict:
+    def get_nft_time_series_v2(self, nft: str or int, bucket: str = None, as_arrays: bool = False) -> dict:
         """
         Get time series data on an NFT collection.
 
@@ -446,11 +694,14 @@ class LunarCrushV4(LunarCrushABC):
         :param str bucket: Leave blank (default) for the most week aggregated by hour, specify hour for full historical
                            data available in hourly aggregation, specify day for full historical data available in
                            daily aggregation.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
         """
-        return self._request(f'/public/nfts/{nft}/time-series/v2', bucket=bucket)
+        response = self._request('/public/nfts/{nft}/time-series/v2', nft=nft, bucket=bucket)
+        return self._time_series(response, as_arrays)
 
     def get_nft_time_series(self, nft: str or int, bucket: str = None, interval: str = None,
-                            start: datetime.datetime = None, end: datetime.datetime = None) -> dict:
+                            start: datetime.datetime = None, end: datetime.datetime = None,
+                            as_arrays: bool = False) -> dict:
         """
         Get time series data on an NFT collection.
 
@@ -460,9 +711,11 @@ class LunarCrushV4(LunarCrushABC):
                              If "start" or "end" parameters are provided this parameter is ignored.
         :param datetime.datetime start: The start time (unix timestamp) to go back to.
         :param datetime.datetime end: The end time (unix timestamp) to stop at.
+        :param bool as_arrays: Return a :class:`TimeSeries` of NumPy columns instead of the JSON response.
         """
-        return self._request(f'/public/nfts/{nft}/time-series/v1',
-                             bucket=bucket, interval=interval, start=start, end=end)
+        response = self._request('/public/nfts/{nft}/time-series/v1', nft=nft,
+                                 bucket=bucket, interval=interval, start=start, end=end)
+        return self._time_series(response, as_arrays)
 
     # Searches endpoints
     def search(self, term: str = None, search_json: str = None) -> dict:
@@ -498,7 +751,7 @@ class LunarCrushV4(LunarCrushABC):
         :param str name: The new name of the search
         :param str search_json: A JSON object (stringified) that defines the search criteria
         """
-        return self._request(f'/public/searches/{slug}/update', name=name, search_json=search_json)
+        return self._request('/public/searches/{slug}/update', slug=slug, name=name, search_json=search_json)
 
     def delete_search(self, slug: str) -> dict:
         """
@@ -506,7 +759,7 @@ class LunarCrushV4(LunarCrushABC):
 
         :param str slug: The ID of the custom search aggregation to delete
         """
-        return self._request(f'/public/searches/{slug}/delete')
+        return self._request('/public/searches/{slug}/delete', slug=slug)
 
     def get_searches(self, slug: str) -> dict:
         """
@@ -514,11 +767,86 @@ class LunarCrushV4(LunarCrushABC):
         
         :param str slug: The ID of the custom search aggregation to view.
         """
-        return self._request(f'/public/searches/{slug}')
+        return self._request('/public/searches/{slug}', slug=slug)
 
     # Systems endpoints
     def get_system_changes(self) -> dict:
         """
         Get recent system changes.
         """
-        return self._request('/public/system/changes')
\ No newline at end of file
+        return self._request('/public/system/changes')
+
+    # Snapshots
+    # Kind -> endpoint listing all the assets of that kind
+    _UNIVERSES = {spec.universe: spec for spec in ENDPOINTS.values() if spec.universe is not None}
+
+    def snapshot_universe(self, kind: str, sort: str = None, filter: str = None, desc: bool = None,
+                          page_size: int = 1000, max_workers: int = None) -> dict:
+        """
+        Take a snapshot of every tracked coin, stock, NFT collection, topic, category or creator. For the paginated
+        lists, the first page gives the number of pages, the others are then requested concurrently so that all of
+        them are taken within a few seconds. Rows moving from one page to the next during the snapshot are only kept
+        once.
+
+        :param str kind: 'coins', 'stocks', 'nfts', 'topics', 'categories' or 'creators'.
+        :param str sort: sort the output by metric, for the paginated lists
+        :param str filter: filter by sub categories / sector from the "categories" key, for the paginated lists
+        :param bool desc: Pass any value as desc and the output will be reversed (descending)
+        :param int page_size: Rows requested per page, maximum 1000.
+        :param int max_workers: Number of pages requested at the same time. Defaults to the connection pool size.
+        :return: The rows and the fetch window of the snapshot, e.g. ``{'kind': 'coins', 'rows': [...],
+                 'total_rows': 3000, 'duplicates': 2, 'pages': 3, 'started': 1700000000.0, 'finished': 1700000001.2}``.
+        """
+        spec = self._universe_endpoint(kind)
+
+        def method(page):
+            return self._request(spec.path, sort=sort, filter=filter, limit=page_size, desc=desc, page=page)
+
+        max_workers = max_workers or self._pool_size
+        started = time.time()
+        pages = [method(0)]
+        total = self._snapshot_total(pages[0])
+        while spec.paginated and (len(pages[-1].get('data') or []) >= page_size
+                                  and (total is None or len(pages) * page_size < total)):
+            # Without a total row count, request the next pages a batch at a time until a short one
+            count = max_workers if total is None else -(-total // page_size) - len(pages)
+            items = range(len(pages), len(pages) + count)
+            pages += self._snapshot_pages(self.map(method, items, max_workers=max_workers))
+        return self._snapshot_result(kind, pages, total, started)
+
+    @classmethod
+    def _universe_endpoint(cls, kind):
+        spec = cls._UNIVERSES.get(kind)
+        if spec is None:
+            raise ValueError(f'Unknown kind {kind!r}, expected one of {", ".join(cls._UNIVERSES)}')
+        return spec
+
+    @staticmethod
+    def _snapshot_total(response):
+        total = (response.get('config') or {}).get('total_rows')
+        return total if isinstance(total, int) else None
+
+    @staticmethod
+    def _snapshot_pages(results):
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    @staticmethod
+    def _snapshot_result(kind, pages, total, started):
+        finished = time.time()
+        rows = []
+        seen = set()
+        for page in pages:
+            if page.get('data') is None:
+                error = page.get('error')
+                raise ValueError("No 'data' array in the response" + (f': {error}' if error else ''))
+            for row in page['data']:
+                # The rows without id, e.g. topics, come from lists that are not paginated
+                if row.get('id') is None or row.get('id') not in seen:
+                    seen.add(row.get('id'))
+                    rows.append(row)
+        return {'kind': kind, 'rows': rows, 'total_rows': total,
+                'duplicates': sum(len(page['data']) for page in pages) - len(rows), 'pages': len(pages),
+                'started': started, 'finished': finished}
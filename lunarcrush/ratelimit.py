@@ -0,0 +1,177 @@
+import re
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Allows ``capacity`` requests per ``period`` seconds, refilled continuously. Requests over the budget are not
+    rejected: they borrow from the future and are told how long to wait for their token.
+    """
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+        self._rate = capacity / period
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def reserve(self, now: float) -> float:
+        self._refill(now)
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self._rate)
+
+    def remaining(self, now: float) -> int:
+        self._refill(now)
+        return max(0, int(self._tokens))
+
+    def drain(self, remaining: int, now: float):
+        self._refill(now)
+        self._tokens = min(self._tokens, remaining)
+
+
+class RateLimiter:
+    """
+    Schedules the requests of a client so they stay within the requests per minute and per day of a plan. Requests
+    over the budget are queued (the caller sleeps) rather than sent. The budget is kept in sync with the
+    ``Retry-After`` and ``X-RateLimit-*`` response headers.
+    """
+
+    # Quotas of the LunarCrush plans, as listed in the README ("Rate Limits by Tier"). Enterprise quotas are set per
+    # contract: pass a RateLimiter with yours when they differ.
+    TIERS = {
+        'individual': {'per_minute': 60, 'per_day': 2000},
+        'pro': {'per_minute': 300, 'per_day': 20000},
+        'enterprise': {'per_minute': 1000, 'per_day': 100000},
+    }
+
+    def __init__(self, per_minute: int = None, per_day: int = None, max_retries: int = 10):
+        """
+        :param int per_minute: Requests allowed per minute.
+        :param int per_day: Requests allowed per day.
+        :param int max_retries: Times a request answered with 429 Too Many Requests is queued again before the 429
+                                response is returned.
+        """
+        self._buckets = {}
+        if per_minute:
+            self._buckets['minute'] = TokenBucket(per_minute, 60)
+        if per_day:
+            self._buckets['day'] = TokenBucket(per_day, 24 * 60 * 60)
+        self.max_retries = max_retries
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_tier(cls, tier: str, **kwargs):
+        """
+        :param str tier: Name of the LunarCrush plan. Options: 'individual', 'pro', 'enterprise'.
+        """
+        return cls(**cls.TIERS[tier.lower()], **kwargs)
+
+    def reserve(self) -> float:
+        """
+        Take a token from every bucket.
+
+        :return: Seconds to wait before sending the request.
+        """
+        now = time.monotonic()
+        with self._lock:
+            delay = max([bucket.reserve(now) for bucket in self._buckets.values()] or [0.0])
+            return max(delay, self._blocked_until - now)
+
+    def acquire(self):
+        """
+        Block until a request can be sent.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def remaining(self) -> dict:
+        """
+        :return: Requests left in each window, e.g. ``{'minute': 42, 'day': 1900}``.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {window: bucket.remaining(now) for window, bucket in self._buckets.items()}
+
+    def update(self, status: int, headers, body: bytes = None) -> bool:
+        """
+        Sync the budget with a response.
+
+        :param int status: HTTP status code of the response.
+        :param headers: Case-insensitive mapping of the response headers.
+        :param bytes body: Body of the response, to detect the rate limits reported with a 200 status by v4, e.g.
+                           ``{"error": "Rate limit exceeded (minute)"}``. None for a streamed response.
+        :return: Whether the request was refused for exceeding a rate limit, and must be sent again.
+        """
+        now = time.monotonic()
+        wait = _parse_retry_after(headers.get('Retry-After'))
+        remaining = headers.get('X-RateLimit-Remaining', headers.get('RateLimit-Remaining'))
+        reset = _parse_reset(headers.get('X-RateLimit-Reset', headers.get('RateLimit-Reset')))
+        window = _exceeded_window(body) if status == 200 else None
+        with self._lock:
+            if remaining is not None and remaining.isdigit() and 'minute' in self._buckets:
+                self._buckets['minute'].drain(int(remaining), now)
+                if int(remaining) == 0 and reset is not None:
+                    wait = max(wait or 0.0, reset)
+            if window is not None:
+                bucket = self._buckets.get(window)
+                if bucket is not None:
+                    bucket.drain(0, now)
+                if wait is None and window == 'day' and bucket is not None:
+                    # Not a whole day: the requests go on at the daily rate, up to max_retries times
+                    wait = bucket.period / bucket.capacity
+            if (status == 429 or window is not None) and wait is None:
+                # No hint from the server, wait for the whole minute window to refill.
+                wait = 60.0
+            if wait:
+                self._blocked_until = max(self._blocked_until, now + wait)
+        return status == 429 or window is not None
+
+
+# Error body of a rate limit reported with a 200 status, e.g. {"error": "Rate limit exceeded (minute)"}
+_EXCEEDED = re.compile(rb'"error"\s*:\s*"[^"]*rate limit exceeded(?:\s*\((minute|day)\))?', re.IGNORECASE)
+
+
+def _exceeded_window(body):
+    """
+    :return: 'minute' or 'day' if ``body`` reports an exceeded rate limit, None otherwise.
+    """
+    # The error bodies are short, the large ones are data
+    if not body or len(body) > 1024:
+        return None
+    match = _EXCEEDED.search(body)
+    if match is None:
+        return None
+    return (match.group(1) or b'minute').decode().lower()
+
+
+def _parse_retry_after(value):
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # HTTP dates are rare here, email is imported only to parse one
+    import email.utils
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time()) if date is not None else None
+
+
+def _parse_reset(value):
+    try:
+        reset = float(value)
+    except (TypeError, ValueError):
+        return None
+    # Either a delay in seconds or a unix timestamp
+    return max(0.0, reset - time.time()) if reset > 1e9 else reset
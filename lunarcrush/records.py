@@ -0,0 +1,111 @@
+class Record:
+    """
+    Row of a list endpoint stored in ``__slots__`` instead of a dict. The known fields of the row type are
+    attributes, None when missing from the row. The fields the row type does not know are kept in :attr:`extra`,
+    and are readable as attributes too.
+
+    :ivar dict extra: Fields of the row not in :attr:`FIELDS`, or None.
+    """
+    __slots__ = ('extra',)
+    FIELDS = ()
+    _FIELD_SET = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+
+    def __init__(self, row: dict):
+        for name in self.FIELDS:
+            setattr(self, name, row.get(name))
+        if row.keys() <= self._FIELD_SET:
+            self.extra = None
+        else:
+            self.extra = {name: value for name, value in row.items() if name not in self._FIELD_SET}
+
+    @classmethod
+    def from_rows(cls, rows) -> list:
+        """
+        :param rows: Rows of a list endpoint, e.g. the ``data`` of a response or the items of an ``iter_*`` method.
+        """
+        return [cls(row) for row in rows]
+
+    def to_dict(self) -> dict:
+        row = {name: getattr(self, name) for name in self.FIELDS}
+        if self.extra:
+            row.update(self.extra)
+        return row
+
+    def __getattr__(self, name):
+        # Only called for the names which are not slots
+        extra = object.__getattribute__(self, 'extra')
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
+    def __getitem__(self, name: str):
+        if name in self._FIELD_SET:
+            return getattr(self, name)
+        if self.extra is not None and name in self.extra:
+            return self.extra[name]
+        raise KeyError(name)
+
+    def get(self, name: str, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.FIELDS[:3])
+        return f'{type(self).__name__}({fields}, ...)'
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, row):
+        self.__init__(row)
+
+
+class Coin(Record):
+    __slots__ = FIELDS = (
+        'id', 'symbol', 'name', 'price', 'price_btc', 'volume_24h', 'volatility', 'circulating_supply', 'max_supply',
+        'percent_change_1h', 'percent_change_24h', 'percent_change_7d', 'percent_change_30d', 'market_cap',
+        'market_cap_rank', 'interactions_24h', 'social_volume_24h', 'social_dominance', 'market_dominance',
+        'market_dominance_prev', 'galaxy_score', 'galaxy_score_previous', 'alt_rank', 'alt_rank_previous', 'sentiment',
+        'categories', 'blockchains', 'topic', 'logo', 'last_updated_price', 'last_updated_price_by',
+    )
+
+
+class Stock(Record):
+    __slots__ = FIELDS = (
+        'id', 'symbol', 'name', 'price', 'volume_24h', 'percent_change_24h', 'market_cap', 'market_cap_rank',
+        'interactions_24h', 'social_volume_24h', 'social_dominance', 'market_dominance', 'market_dominance_prev',
+        'galaxy_score', 'galaxy_score_previous', 'alt_rank', 'alt_rank_previous', 'sentiment', 'categories', 'topic',
+        'logo', 'last_updated_price', 'last_updated_price_by',
+    )
+
+
+class Nft(Record):
+    __slots__ = FIELDS = (
+        'id', 'lunar_id', 'base_crypto', 'name', 'floor_price', 'volume_24h', 'percent_change_24h', 'market_cap',
+        'market_cap_rank', 'interactions_24h', 'social_contributors', 'social_volume_24h', 'social_dominance',
+        'market_dominance', 'galaxy_score', 'galaxy_score_previous', 'alt_rank', 'alt_rank_previous', 'sentiment',
+        'categories', 'topic', 'logo',
+    )
+
+
+class Topic(Record):
+    __slots__ = FIELDS = (
+        'topic', 'title', 'topic_rank', 'topic_rank_1h_previous', 'topic_rank_24h_previous', 'num_contributors',
+        'num_posts', 'interactions_24h',
+    )
+
+
+class Creator(Record):
+    __slots__ = FIELDS = (
+        'creator_name', 'creator_display_name', 'creator_id', 'creator_network', 'creator_avatar', 'creator_followers',
+        'creator_rank', 'interactions_24h',
+    )
@@ -0,0 +1,137 @@
+import random
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request to an endpoint family whose circuit breaker is open.
+    """
+
+    def __init__(self, family: str, retry_in: float):
+        super().__init__(f'Circuit open for {family}, retry in {retry_in:.1f}s')
+        self.family = family
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """
+    Retries idempotent requests failing with a connection error, a timeout or a server error, waiting an exponential
+    backoff with full jitter between the attempts.
+    """
+
+    def __init__(self, max_retries: int = 3, backoff: float = 0.5, max_backoff: float = 30, max_elapsed: float = 60,
+                 statuses: tuple = (500, 502, 503, 504)):
+        """
+        :param int max_retries: Maximum number of retries of a request.
+        :param float backoff: Base delay in seconds, doubled on every retry.
+        :param float max_backoff: Maximum delay in seconds between two attempts.
+        :param float max_elapsed: Do not start a retry that would end more than this many seconds after the first
+                                  attempt.
+        :param tuple statuses: HTTP status codes to retry.
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_elapsed = max_elapsed
+        self.statuses = statuses
+
+    def next_delay(self, attempt: int, started: float):
+        """
+        :param int attempt: Number of the attempt that failed, starting at 0.
+        :param float started: time.monotonic() of the first attempt.
+        :return: Seconds to wait before the next attempt, or None to give up.
+        """
+        if attempt >= self.max_retries:
+            return None
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        if time.monotonic() + delay - started > self.max_elapsed:
+            return None
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failures, making the following requests fail fast for
+    ``reset_timeout`` seconds. Then a single probe request is let through: its success closes the circuit, its failure
+    opens it again.
+    """
+
+    def __init__(self, family: str, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.family = family
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return 'closed'
+        if self._probing or time.monotonic() - self._opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def before(self):
+        """
+        :raises CircuitOpenError: If the request must not be sent.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            retry_in = self._opened_at + self.reset_timeout - time.monotonic()
+            if retry_in > 0 or self._probing:
+                raise CircuitOpenError(self.family, max(retry_in, 0.0))
+            self._probing = True
+
+    def release(self):
+        """
+        End a request without counting it, e.g. one cancelled by the caller: it says nothing of the endpoint. A probe
+        request released lets the next one through.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record(self, success: bool):
+        with self._lock:
+            self._probing = False
+            if success:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class CircuitBreakers:
+    """
+    One :class:`CircuitBreaker` per endpoint family (e.g. '/public/topic', '/public/coins'), created on first use.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        """
+        :param int failure_threshold: Consecutive failures opening the circuit of an endpoint family.
+        :param float reset_timeout: Seconds an open circuit fails fast before letting a probe request through.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, family: str) -> CircuitBreaker:
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    family, CircuitBreaker(family, self.failure_threshold, self.reset_timeout)
+                )
+        return breaker
+
+    def states(self) -> dict:
+        """
+        :return: State of the circuit of every endpoint family seen so far, e.g. ``{'/public/topic': 'closed'}``.
+        """
+        return {family: breaker.state for family, breaker in list(self._breakers.items())}
@@ -0,0 +1,115 @@
+import json
+import sqlite3
+import threading
+import time
+
+from lunarcrush.base import _BUCKET_SECONDS, _timestamp
+
+_DEFAULT_LOOKBACK = 7 * 24 * 60 * 60
+
+
+class SeriesStore:
+    """
+    Local copy of LunarCrushV4 time series, stored in a SQLite database per (entity, bucket). :meth:`sync` only
+    requests the buckets newer than the last complete one it has, the still open bucket included, and :meth:`read`
+    serves the series without any request.
+    """
+
+    # kind -> range method of the client
+    KINDS = {
+        'topic': 'get_topic_time_series_range',
+        'category': 'get_category_time_series_range',
+        'creator': 'get_creator_time_series_range',
+        'coin': 'get_coin_time_series_range',
+        'stock': 'get_stock_time_series_range',
+    }
+
+    def __init__(self, client, path: str = ':memory:'):
+        """
+        :param LunarCrushV4 client: Client to request the time series with.
+        :param str path: SQLite database file. Defaults to an in-memory database.
+        """
+        self.client = client
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS points (
+                series TEXT, time INTEGER, row TEXT, PRIMARY KEY (series, time)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS complete (series TEXT PRIMARY KEY, time INTEGER);
+        ''')
+
+    def close(self):
+        self._db.close()
+
+    def sync(self, kind: str, entity, bucket: str = 'hour', start=None, max_workers: int = None) -> int:
+        """
+        Request the buckets of a series missing from the store: the ones after its last complete bucket, or from
+        ``start`` on the first sync.
+
+        :param str kind: 'topic', 'category', 'creator', 'coin' or 'stock'.
+        :param str or tuple entity: Topic, category, coin or stock, or (network, id) of a creator.
+        :param str bucket: 'hour' or 'day'.
+        :param datetime.datetime or int start: Start of the series on the first sync. Defaults to a week ago.
+        :param int max_workers: Number of requests sent at the same time. Defaults to the connection pool size.
+        :return: Number of buckets received.
+        """
+        series = self._series(kind, entity, bucket)
+        step = _BUCKET_SECONDS[bucket]
+        now = int(time.time())
+        last = self.last_complete(kind, entity, bucket)
+        if last is not None:
+            first = last + step
+        else:
+            first = _timestamp(start) if start is not None else now - _DEFAULT_LOOKBACK
+        # Up to the end of the open bucket, to refresh its partial values
+        end = (now // step + 1) * step
+        if first >= end:
+            return 0
+        entity = entity if isinstance(entity, tuple) else (entity,)
+        rows = getattr(self.client, self.KINDS[kind])(*entity, first, end, bucket=bucket,
+                                                      max_workers=max_workers)['data']
+        complete = [row['time'] for row in rows if row['time'] + step <= now]
+        with self._lock:
+            self._db.execute('BEGIN')
+            self._db.executemany('INSERT OR REPLACE INTO points VALUES (?, ?, ?)',
+                                 [(series, row['time'], json.dumps(row)) for row in rows])
+            if complete:
+                self._db.execute('INSERT OR REPLACE INTO complete VALUES (?, ?)', (series, max(complete)))
+            self._db.execute('COMMIT')
+        return len(rows)
+
+    def read(self, kind: str, entity, bucket: str = 'hour', start=None, end=None) -> list:
+        """
+        :param datetime.datetime or int start: Only return the buckets from this time, included.
+        :param datetime.datetime or int end: Only return the buckets before this time.
+        :return: The stored rows of a series, sorted by time.
+        """
+        query = 'SELECT row FROM points WHERE series = ?'
+        params = (self._series(kind, entity, bucket),)
+        if start is not None:
+            query += ' AND time >= ?'
+            params += (_timestamp(start),)
+        if end is not None:
+            query += ' AND time < ?'
+            params += (_timestamp(end),)
+        with self._lock:
+            rows = self._db.execute(query + ' ORDER BY time', params).fetchall()
+        return [json.loads(row) for row, in rows]
+
+    def last_complete(self, kind: str, entity, bucket: str = 'hour'):
+        """
+        :return: Unix timestamp of the last complete bucket stored, or None if the series was never synced.
+        """
+        with self._lock:
+            row = self._db.execute('SELECT time FROM complete WHERE series = ?',
+                                   (self._series(kind, entity, bucket),)).fetchone()
+        return row[0] if row is not None else None
+
+    def _series(self, kind, entity, bucket):
+        if kind not in self.KINDS:
+            raise ValueError(f'Unknown kind {kind!r}, expected one of {", ".join(self.KINDS)}')
+        entity = '/'.join(map(str, entity)) if isinstance(entity, tuple) else str(entity)
+        return f'{kind}:{entity}:{bucket}'
@@ -0,0 +1,151 @@
+import codecs
+import gzip
+import json
+import re
+
+_START, _KEY, _COLON, _VALUE, _NEXT, _ARRAY, _FIRST_ITEM, _ITEM, _NEXT_ITEM, _DONE = range(10)
+_WHITESPACE = ' \t\n\r'
+_INCOMPLETE = object()
+# Characters that can end the buffer in the middle of a number, e.g. '0.' or '1.5e+'
+_NUMBER_TAIL = re.compile(r'[0-9+\-.eE]*\Z')
+
+
+class ArrayStreamParser:
+    """
+    Incremental JSON parser returning the items of one array member of a JSON object, e.g. the rows of ``data`` in
+    ``{"config": {...}, "data": [{...}, {...}]}``, as the response body is received. Only one item at a time and the
+    bytes not parsed yet are held in memory. The other members of the object are kept in :attr:`members`.
+    """
+
+    def __init__(self, key: str = 'data'):
+        self.key = key
+        self.members = {}
+        self.found = False
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._state = _START
+        self._member = None
+
+    def feed(self, chunk: bytes, final: bool = False) -> list:
+        """
+        :param bytes chunk: Next bytes of the response body.
+        :param bool final: True once the whole body was fed.
+        :return: The items completed by this chunk.
+        """
+        self._buffer = self._buffer[self._pos:] + self._text.decode(chunk, final)
+        self._pos = 0
+        items = []
+        while self._parse_next(items, final):
+            pass
+        if final:
+            self._check_complete()
+        return items
+
+    def _parse_next(self, items, final):
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        if pos == len(buffer):
+            return False
+        char = buffer[pos]
+        state = self._state
+
+        if state == _START:
+            self._expect(char, '{')
+            self._state = _KEY
+        elif state == _KEY:
+            if char == '}':
+                self._state = _DONE
+                self._pos += 1
+                return True
+            member = self._decode(final)
+            if member is _INCOMPLETE:
+                return False
+            self._member = member
+            self._state = _COLON
+            return True
+        elif state == _COLON:
+            self._expect(char, ':')
+            self._state = _ARRAY if self._member == self.key else _VALUE
+        elif state == _VALUE:
+            value = self._decode(final)
+            if value is _INCOMPLETE:
+                return False
+            self.members[self._member] = value
+            self._state = _NEXT
+            return True
+        elif state == _NEXT:
+            self._expect(char, ',}')
+            self._state = _KEY if char == ',' else _DONE
+        elif state == _ARRAY:
+            self._expect(char, '[')
+            self.found = True
+            self._state = _FIRST_ITEM
+        elif state in (_FIRST_ITEM, _ITEM):
+            if char == ']' and state == _FIRST_ITEM:
+                self._state = _NEXT
+                self._pos += 1
+                return True
+            item = self._decode(final)
+            if item is _INCOMPLETE:
+                return False
+            items.append(item)
+            self._state = _NEXT_ITEM
+            return True
+        elif state == _NEXT_ITEM:
+            self._expect(char, ',]')
+            self._state = _ITEM if char == ',' else _NEXT
+        else:
+            raise ValueError(f'Unexpected data after the end of the JSON object at position {pos}')
+        self._pos += 1
+        return True
+
+    @staticmethod
+    def _expect(char, expected):
+        if char not in expected:
+            raise ValueError(f'Expected {" or ".join(expected)!r} but found {char!r}')
+
+    def _decode(self, final):
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return _INCOMPLETE
+        if not final and _NUMBER_TAIL.match(self._buffer, end):
+            # A number may continue in the next chunk: '0.' was decoded as 0
+            return _INCOMPLETE
+        self._pos = end
+        return value
+
+    def _check_complete(self):
+        if self._state != _DONE:
+            raise ValueError('The JSON response is truncated')
+        if not self.found:
+            error = self.members.get('error')
+            raise ValueError(f'No {self.key!r} array in the response' + (f': {error}' if error else ''))
+
+
+def iter_array(chunks, key: str = 'data'):
+    """
+    Yield the items of the ``key`` array of the JSON object made of ``chunks`` of bytes.
+    """
+    parser = ArrayStreamParser(key)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.feed(b'', final=True)
+
+
+def iter_file(path: str, key: str = 'data', chunk_size: int = 64 * 1024):
+    """
+    Yield the items of the ``key`` array of a JSON file, e.g. a historical dump written by one of the ``download_*``
+    methods. gzip compressed files are decompressed on the fly.
+    """
+    with open(path, 'rb') as file:
+        gzipped = file.read(2) == b'\x1f\x8b'
+    with (gzip.open(path, 'rb') if gzipped else open(path, 'rb')) as file:
+        yield from iter_array(iter(lambda: file.read(chunk_size), b''), key)
@@ -0,0 +1,271 @@
+import hashlib
+import io
+import json
+import os
+import threading
+import urllib.parse
+from abc import ABC, abstractmethod
+
+from lunarcrush.ratelimit import _exceeded_window
+
+# requests and urllib3 are imported when a transport is opened, see LunarCrushABC._get_transport
+
+
+class Transport(ABC):
+    """
+    Sends the GET requests of a client. A transport is opened by the client before its first request, and is then
+    shared by all its threads.
+
+    The responses have the attributes of a ``requests.Response`` used by the clients: ``status_code``, ``headers``,
+    ``content``, ``iter_content()``, ``raw`` (an urllib3 response, when streamed), ``raise_for_status()`` and
+    ``close()``, and are context managers.
+
+    :ivar tuple errors: Exceptions of a failed connection or a timeout, retried by the client's RetryPolicy.
+    """
+    errors = ()
+
+    def open(self, headers: dict, pool_size: int, timeout: float or tuple):
+        """
+        :param dict headers: Headers of every request, e.g. the Authorization header.
+        :param int pool_size: Maximum number of keep-alive connections kept open to the API host.
+        :param float or tuple timeout: Request timeout in seconds, either a single value or a (connect, read) tuple.
+        """
+
+    @abstractmethod
+    def get(self, url: str, headers: dict = None, stream: bool = False):
+        """
+        :param dict headers: Headers added to the ones of :meth:`open` for this request.
+        :param bool stream: Read the body as it is consumed, from ``raw`` or ``iter_content()``, instead of at once.
+        """
+
+    def close(self):
+        """
+        Release the connections. The transport is opened again by the next request of the client.
+        """
+
+
+class Response:
+    """
+    Response of the transports not based on requests, wrapping an urllib3 response.
+    """
+
+    def __init__(self, raw, url: str):
+        self.raw = raw
+        self.url = url
+        self.status_code = raw.status
+        self.headers = raw.headers
+        self._content = None
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            self._content = self.raw.data
+        return self._content
+
+    def iter_content(self, chunk_size: int = 64 * 1024):
+        return self.raw.stream(chunk_size, decode_content=True)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f'{self.status_code} Error for url: {self.url}', response=self)
+
+    def close(self):
+        self.raw.release_conn()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _response(url, status, headers, body):
+    import urllib3
+
+    raw = urllib3.HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, preload_content=False,
+                               decode_content=True)
+    return Response(raw, url)
+
+
+class RequestsTransport(Transport):
+    """
+    requests.Session with a connection pool of ``pool_size`` connections, the default transport.
+    """
+
+    def __init__(self):
+        self._session = None
+        self._timeout = None
+
+    def open(self, headers, pool_size, timeout):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.request import ACCEPT_ENCODING
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        # Every encoding urllib3 can decode here: gzip and deflate, plus br/zstd when brotli/zstandard are installed
+        session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        session.headers.update(headers)
+        self.errors = (requests.ConnectionError, requests.Timeout)
+        self._timeout = timeout
+        self._session = session
+
+    def get(self, url, headers=None, stream=False):
+        return self._session.get(url, headers=headers, timeout=self._timeout, stream=stream)
+
+    def close(self):
+        session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+
+class Urllib3Transport(Transport):
+    """
+    urllib3.PoolManager used directly, without the request preparation of requests: cheaper per request. Redirects are
+    followed, the retries are left to the client's RetryPolicy.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._headers = None
+
+    def open(self, headers, pool_size, timeout):
+        import urllib3
+        from urllib3.util.request import ACCEPT_ENCODING
+
+        if isinstance(timeout, tuple):
+            timeout = urllib3.Timeout(connect=timeout[0], read=timeout[1])
+        self._headers = dict(headers, **{'Accept-Encoding': ACCEPT_ENCODING})
+        retries = urllib3.Retry(total=None, connect=0, read=0, status=0, other=0, redirect=5,
+                                raise_on_redirect=False)
+        self._pool = urllib3.PoolManager(maxsize=pool_size, headers=self._headers, timeout=timeout, retries=retries)
+        self.errors = (urllib3.exceptions.MaxRetryError, urllib3.exceptions.TimeoutError,
+                       urllib3.exceptions.ProtocolError)
+
+    def get(self, url, headers=None, stream=False):
+        # The headers of a request replace the default ones of the pool instead of extending them
+        headers = dict(self._headers, **headers) if headers else self._headers
+        return Response(self._pool.request('GET', url, headers=headers, preload_content=not stream), url)
+
+    def close(self):
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.clear()
+
+
+class InProcessTransport(Transport):
+    """
+    Serves the requests with a function, in the same process and without any socket, e.g. to test code using a
+    client, or to load test it without network.
+    """
+
+    def __init__(self, handler: callable):
+        """
+        :param callable handler: Called as ``handler(url, headers)`` with the URL and the headers of the request,
+                                 returns the ``(status, headers, body)`` of the response, the body as bytes.
+        """
+        self.handler = handler
+        self._headers = {}
+
+    def open(self, headers, pool_size, timeout):
+        self._headers = headers
+
+    def get(self, url, headers=None, stream=False):
+        status, response_headers, body = self.handler(url, dict(self._headers, **headers) if headers else self._headers)
+        return _response(url, status, response_headers, body)
+
+
+class ReplayTransport(Transport):
+    """
+    Serves the responses recorded in a directory, one file per URL: without network, e.g. to load test a deployment,
+    to reproduce a run, or to warm a cache. With ``record=True`` the URLs not recorded yet are requested with
+    ``transport`` and recorded, the others replayed.
+
+    The ``key`` query parameter of the v2 URLs is left out of the recordings: they can be replayed with any API key.
+    Bodies are recorded decompressed. Only the successful (2XX) responses are recorded.
+    """
+
+    def __init__(self, path: str, record: bool = False, transport: str or Transport = 'requests'):
+        """
+        :param str path: Directory of the recordings, created if missing.
+        :param bool record: Request and record the URLs not recorded yet. Otherwise they raise a LookupError.
+        :param str or Transport transport: Transport requesting the URLs to record.
+        """
+        self.path = path
+        self.record = record
+        self.transport = get_transport(transport) if record else None
+        self._lock = threading.Lock()
+
+    def open(self, headers, pool_size, timeout):
+        if self.transport is not None:
+            self.transport.open(headers, pool_size, timeout)
+            self.errors = self.transport.errors
+        os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def redact(url: str) -> str:
+        """
+        :return: The URL without its API key.
+        """
+        parts = urllib.parse.urlsplit(url)
+        query = [(name, value) for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+                 if name != 'key']
+        return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+
+    def file(self, url: str) -> str:
+        """
+        :return: The file recording the response of a URL.
+        """
+        return os.path.join(self.path, hashlib.sha256(self.redact(url).encode()).hexdigest()[:32] + '.http')
+
+    def get(self, url, headers=None, stream=False):
+        file = self.file(url)
+        try:
+            with open(file, 'rb') as recording:
+                meta = json.loads(recording.readline())
+                body = recording.read()
+        except FileNotFoundError:
+            if not self.record:
+                raise LookupError(f'No recorded response for {self.redact(url)} in {self.path}') from None
+            return self._record(url, file)
+        return _response(url, meta['status'], meta['headers'], body)
+
+    def _record(self, url, file):
+        with self.transport.get(url) as response:
+            body = response.content
+            status = response.status_code
+            # The body is stored decoded, with its length
+            headers = {name: value for name, value in response.headers.items()
+                       if name.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')}
+        if not 200 <= status < 300 or _exceeded_window(body) is not None:
+            # Errors, e.g. a 429, a 503 or a rate limit reported with a 200 status, are temporary: the URL is requested
+            # again next time instead of replaying them
+            return _response(url, status, headers, body)
+        meta = {'url': self.redact(url), 'status': status, 'headers': headers}
+        with self._lock:
+            with open(file + '.part', 'wb') as recording:
+                recording.write(json.dumps(meta).encode() + b'\n')
+                recording.write(body)
+            os.replace(file + '.part', file)
+        return _response(url, status, headers, body)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+
+TRANSPORTS = {'requests': RequestsTransport, 'urllib3': Urllib3Transport}
+
+
+def get_transport(transport: str or Transport = 'requests') -> Transport:
+    """
+    :param str or Transport transport: 'requests', 'urllib3', or a Transport.
+    """
+    if isinstance(transport, Transport):
+        return transport
+    if transport not in TRANSPORTS:
+        raise ValueError(f'Unknown transport {transport!r}, expected one of {", ".join(TRANSPORTS)} or a Transport')
+    return TRANSPORTS[transport]()
@@ -0,0 +1,63 @@
+import json
+import unittest
+
+from lunarcrush import LunarCrushV3
+from lunarcrush.cache import CacheEntry, MemoryBackend, ResponseCache
+from lunarcrush.transport import InProcessTransport
+
+
+class MemoryBackendTest(unittest.TestCase):
+
+    def test_evicts_by_size(self):
+        backend = MemoryBackend(max_entries=100, max_bytes=1000)
+        for i in range(5):
+            backend.set(str(i), CacheEntry(i, 0, size=300))
+        self.assertEqual(len(backend), 3)
+        self.assertEqual(backend.size, 900)
+        self.assertIsNone(backend.get('1'))
+        self.assertIsNotNone(backend.get('2'))
+
+    def test_least_recently_used_first(self):
+        backend = MemoryBackend(max_bytes=1000)
+        backend.set('a', CacheEntry('a', 0, size=400))
+        backend.set('b', CacheEntry('b', 0, size=400))
+        backend.get('a')
+        backend.set('c', CacheEntry('c', 0, size=400))
+        self.assertIsNone(backend.get('b'))
+        self.assertIsNotNone(backend.get('a'))
+
+    def test_too_large_entry_is_not_kept(self):
+        backend = MemoryBackend(max_bytes=1000)
+        backend.set('a', CacheEntry('a', 0, size=100))
+        backend.set('b', CacheEntry('b', 0, size=1001))
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(backend.size, 100)
+
+    def test_size_accounting(self):
+        backend = MemoryBackend(max_bytes=1000)
+        backend.set('a', CacheEntry('a', 0, size=100))
+        backend.set('a', CacheEntry('a', 0, size=200))
+        self.assertEqual(backend.size, 200)
+        backend.delete('a')
+        self.assertEqual(backend.size, 0)
+        backend.set('b', CacheEntry('b', 0, size=100))
+        backend.clear()
+        self.assertEqual((backend.size, len(backend)), (0, 0))
+
+
+class ClientCacheSizeTest(unittest.TestCase):
+
+    def test_response_size_is_counted(self):
+        body = json.dumps({'data': [{'id': i, 'symbol': f'C{i}'} for i in range(100)]}).encode()
+
+        def handler(url, headers):
+            return 200, {'Content-Type': 'application/json'}, body
+
+        cache = ResponseCache(MemoryBackend(max_bytes=len(body) * 2))
+        client = LunarCrushV3('key', cache=cache, transport=InProcessTransport(handler))
+        client.get_coins_list()
+        self.assertEqual(cache.backend.size, len(body))
+
+
+if __name__ == '__main__':
+    unittest.main()
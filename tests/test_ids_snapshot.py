@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from lunarcrush import LunarCrushV3
+
+
+class IdsSnapshotTest(unittest.TestCase):
+
+    def test_concurrent_writers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ids.json')
+            # One client per writer, as in separate processes: their locks do not serialize the writes
+            clients = [LunarCrushV3('key', ids_path=path) for _ in range(8)]
+            errors = []
+
+            def write(client, i):
+                try:
+                    for j in range(20):
+                        client._write_ids_snapshot('coins' if j % 2 else 'nfts', {f'C{i}': i})
+                except Exception as error:
+                    errors.append(error)
+
+            threads = [threading.Thread(target=write, args=(client, i)) for i, client in enumerate(clients)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(errors, [])
+            self.assertEqual(os.listdir(directory), ['ids.json'])
+            with open(path) as file:
+                snapshot = json.load(file)
+            # The last write was of coins, the nfts may have been dropped by a concurrent write read before them
+            self.assertIn(snapshot['coins']['ids'], [{f'C{i}': i} for i in range(8)])
+
+    def test_unreadable_snapshot(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ids.json')
+            client = LunarCrushV3('key', ids_path=path)
+            self.assertEqual(client._read_ids_snapshot(), {})
+            with open(path, 'w') as file:
+                file.write('{"coins": ')
+            self.assertEqual(client._read_ids_snapshot(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
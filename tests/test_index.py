@@ -0,0 +1,94 @@
+import json
+import time
+import unittest
+import urllib.parse
+
+from lunarcrush import LunarCrushV4
+from lunarcrush.index import SymbolIndex
+from lunarcrush.transport import InProcessTransport
+
+
+class FakeServer:
+    """
+    v4 coins list, coin details and system changes, with the clock of the server ``skew`` seconds behind this one.
+    """
+
+    def __init__(self, skew: float = 0):
+        self.skew = skew
+        self.coins = {1: {'id': 1, 'symbol': 'BTC', 'name': 'Bitcoin'}}
+        # Reaches back before any sync
+        self.changes = [{'asset_type': 'topic', 'asset_id': 'bitcoin', 'time': 1}]
+        self.requests = []
+
+    def now(self):
+        return int(time.time() - self.skew)
+
+    def add(self, coin):
+        self.coins[coin['id']] = coin
+        self.changes.append({'asset_type': 'coin', 'asset_id': coin['id'], 'change': 'added', 'time': self.now()})
+
+    def handler(self, url, headers):
+        path = urllib.parse.urlsplit(url).path
+        self.requests.append(path)
+        if path == '/api4/public/coins/list/v2':
+            body = {'config': {'total_rows': len(self.coins)}, 'data': list(self.coins.values())}
+        elif path == '/api4/public/system/changes':
+            body = {'data': list(self.changes)}
+        elif path.startswith('/api4/public/coins/') and path.endswith('/v1'):
+            body = {'data': self.coins.get(int(path.split('/')[-2]), {})}
+        else:
+            return 404, {}, b'{"error": "Not found"}'
+        return 200, {'Content-Type': 'application/json'}, json.dumps(body).encode()
+
+
+class SymbolIndexRefreshTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeServer()
+        self.client = LunarCrushV4('key', cache=True, transport=InProcessTransport(self.server.handler))
+        self.index = SymbolIndex(self.client)
+        self.index.build(['coins'])
+
+    def tearDown(self):
+        self.index.close()
+        self.client.close()
+
+    def test_change_after_a_refresh_is_not_lost(self):
+        self.index.refresh(['coins'])
+        self.server.add({'id': 2, 'symbol': 'ETH', 'name': 'Ethereum'})
+        self.index.refresh(['coins'])
+        self.assertEqual([entry['id'] for entry in self.index.lookup('eth')], ['2'])
+
+    def test_change_feed_is_not_cached(self):
+        requested = self.server.requests.count('/api4/public/system/changes')
+        self.index.refresh(['coins'])
+        self.index.refresh(['coins'])
+        self.assertEqual(self.server.requests.count('/api4/public/system/changes'), requested + 2)
+
+    def test_change_right_after_the_build(self):
+        # Most likely within the second of the build
+        self.server.add({'id': 2, 'symbol': 'ETH', 'name': 'Ethereum'})
+        self.index.refresh(['coins'])
+        self.assertEqual([entry['id'] for entry in self.index.lookup('eth')], ['2'])
+
+    def test_sync_time_from_the_feed(self):
+        self.server.skew = 120
+        self.index.refresh(['coins'])
+        self.server.add({'id': 2, 'symbol': 'ETH', 'name': 'Ethereum'})
+        self.index.refresh(['coins'])
+        self.assertEqual(self.index.synced()['coins'], self.server.changes[-1]['time'])
+        # Changed after the last refresh by the clock of the server, before it by the clock of this machine
+        self.server.add({'id': 3, 'symbol': 'SOL', 'name': 'Solana'})
+        self.index.refresh(['coins'])
+        self.assertEqual([entry['id'] for entry in self.index.lookup('sol')], ['3'])
+
+    def test_empty_feed_keeps_the_sync_time(self):
+        self.server.changes = []
+        synced = self.index.synced()['coins']
+        self.index.refresh(['coins'])
+        self.assertEqual(self.index.synced()['coins'], synced)
+        self.assertEqual(self.server.requests.count('/api4/public/coins/list/v2'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
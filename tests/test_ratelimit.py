@@ -0,0 +1,64 @@
+import json
+import unittest
+
+from lunarcrush import LunarCrushV4
+from lunarcrush.ratelimit import RateLimiter
+from lunarcrush.transport import InProcessTransport
+
+LIMITED = {'error': 'Rate limit exceeded (minute)'}
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_tiers_have_daily_quotas(self):
+        for tier in RateLimiter.TIERS:
+            with self.subTest(tier=tier):
+                self.assertEqual(set(RateLimiter.from_tier(tier).remaining()), {'minute', 'day'})
+
+    def test_429_blocks(self):
+        limiter = RateLimiter(per_minute=300)
+        self.assertTrue(limiter.update(429, {'Retry-After': '5'}))
+        self.assertGreater(limiter.reserve(), 4)
+
+    def test_error_body_blocks_and_drains_its_window(self):
+        for window, expected in (('minute', 59), ('day', 4)):
+            with self.subTest(window=window):
+                limiter = RateLimiter.from_tier('pro')
+                body = json.dumps({'error': f'Rate limit exceeded ({window})'}).encode()
+                self.assertTrue(limiter.update(200, {}, body))
+                self.assertEqual(limiter.remaining()[window], 0)
+                self.assertGreater(limiter.reserve(), expected)
+
+    def test_data_is_not_a_rate_limit(self):
+        limiter = RateLimiter.from_tier('pro')
+        self.assertFalse(limiter.update(200, {}, b'{"data": {"error": "Rate limit exceeded"}}' + b' ' * 2000))
+        self.assertFalse(limiter.update(200, {}, b'{"error": "You must have a Enterprise subscription"}'))
+        self.assertFalse(limiter.update(200, {}, None))
+        self.assertEqual(limiter.reserve(), 0)
+
+
+class ClientRateLimitTest(unittest.TestCase):
+
+    def test_error_body_is_sent_again(self):
+        responses = [LIMITED, LIMITED, {'data': {'topic': 'btc'}}]
+
+        def handler(url, headers):
+            # Retry-After 0 keeps the test from sleeping
+            return 200, {'Retry-After': '0'}, json.dumps(responses.pop(0)).encode()
+
+        client = LunarCrushV4('key', rate_limit='pro', transport=InProcessTransport(handler))
+        self.assertEqual(client.get_topic('btc'), {'data': {'topic': 'btc'}})
+        self.assertEqual(responses, [])
+        self.assertEqual(client.rate_limiter.remaining()['minute'], 0)
+
+    def test_error_body_returned_after_max_retries(self):
+        def handler(url, headers):
+            return 200, {'Retry-After': '0'}, json.dumps(LIMITED).encode()
+
+        client = LunarCrushV4('key', rate_limit=RateLimiter(per_minute=300, max_retries=2),
+                              transport=InProcessTransport(handler))
+        self.assertEqual(client.get_topic('btc'), LIMITED)
+
+
+if __name__ == '__main__':
+    unittest.main()
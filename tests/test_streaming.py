@@ -0,0 +1,122 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from lunarcrush.streaming import ArrayStreamParser, iter_array, iter_file
+
+ROWS = [
+    {'time': 1700000000, 'close': 37123.456789, 'volume': 12345678901234, 'name': 'Bitcoin'},
+    {'time': 1700003600, 'close': -0.5e-7, 'volume': 0, 'name': 'Ünïcødé ₿ 日本'},
+    {'time': 1700007200, 'close': None, 'volume': 3, 'name': 'quote " backslash \\ tab \t   🚀'},
+    [1, 2.5, True, False, None, 'nested', {'a': [[]]}],
+    12345.678,
+    'plain',
+]
+BODY = {'config': {'coin': 'BTC', 'unicode': 'é'}, 'data': ROWS, 'total': 3}
+
+
+def _chunks(body: bytes, size: int):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def _parse(body: bytes, size: int, key: str = 'data'):
+    parser = ArrayStreamParser(key)
+    items = []
+    for chunk in _chunks(body, size):
+        items += parser.feed(chunk)
+    items += parser.feed(b'', final=True)
+    return items, parser
+
+
+class ArrayStreamParserTest(unittest.TestCase):
+
+    def test_chunk_sizes(self):
+        for ensure_ascii in (True, False):
+            for indent in (None, 2):
+                body = json.dumps(BODY, ensure_ascii=ensure_ascii, indent=indent).encode()
+                for size in (1, 2, 3, 7, 13, 64, len(body)):
+                    with self.subTest(ensure_ascii=ensure_ascii, indent=indent, size=size):
+                        items, parser = _parse(body, size)
+                        self.assertEqual(items, ROWS)
+                        self.assertEqual(parser.members, {'config': BODY['config'], 'total': 3})
+
+    def test_numbers_split_across_chunks(self):
+        body = b'{"data": [12345678901234567890, -1.25e+10, 0.000001, 7]}'
+        for size in range(1, len(body) + 1):
+            with self.subTest(size=size):
+                self.assertEqual(_parse(body, size)[0], [12345678901234567890, -1.25e+10, 0.000001, 7])
+
+    def test_multibyte_characters_split_across_chunks(self):
+        body = json.dumps({'data': ['日本語', '₿🚀']}, ensure_ascii=False).encode()
+        for size in range(1, 8):
+            with self.subTest(size=size):
+                self.assertEqual(_parse(body, size)[0], ['日本語', '₿🚀'])
+
+    def test_members_after_data(self):
+        body = b'{"data": [{"a": 1}], "config": {"page": 2}, "error": null}'
+        items, parser = _parse(body, 5)
+        self.assertEqual(items, [{'a': 1}])
+        self.assertEqual(parser.members, {'config': {'page': 2}, 'error': None})
+
+    def test_empty_array_and_object(self):
+        self.assertEqual(_parse(b'{"data": []}', 1)[0], [])
+        self.assertEqual(_parse(b' \n{ "config" : {} , "data" : [ ] } \n', 3)[0], [])
+
+    def test_other_key(self):
+        body = b'{"data": {"id": 1}, "rows": [1, 2]}'
+        items, parser = _parse(body, 4, key='rows')
+        self.assertEqual(items, [1, 2])
+        self.assertEqual(parser.members, {'data': {'id': 1}})
+
+    def test_items_returned_as_they_complete(self):
+        parser = ArrayStreamParser()
+        self.assertEqual(parser.feed(b'{"data": [{"a": 1}, {"b"'), [{'a': 1}])
+        self.assertEqual(parser.feed(b': 2}, 3'), [{'b': 2}])
+        # The number may go on in the next chunk
+        self.assertEqual(parser.feed(b'4'), [])
+        self.assertEqual(parser.feed(b']}'), [34])
+        self.assertEqual(parser.feed(b'', final=True), [])
+
+    def test_truncated_body(self):
+        body = json.dumps(BODY).encode()
+        for end in (0, 1, 10, body.index(b'[') + 1, len(body) // 2, len(body) - 2, len(body) - 1):
+            with self.subTest(end=end):
+                with self.assertRaises(ValueError):
+                    _parse(body[:end], 7)
+
+    def test_error_body_without_data(self):
+        with self.assertRaisesRegex(ValueError, "No 'data' array in the response: Rate limit exceeded"):
+            _parse(b'{"error": "Rate limit exceeded (minute)"}', 3)
+        with self.assertRaisesRegex(ValueError, "No 'data' array in the response$"):
+            _parse(b'{"config": {}}', 3)
+
+    def test_invalid_json(self):
+        for body in (b'[1, 2]', b'{"data": [1 2]}', b'{"data": {"a": 1}}', b'{"data": [1]} {}', b'{"data" [1]}'):
+            with self.subTest(body=body):
+                with self.assertRaises(ValueError):
+                    _parse(body, 4)
+
+
+class IterTest(unittest.TestCase):
+
+    def test_iter_array(self):
+        body = json.dumps(BODY).encode()
+        self.assertEqual(list(iter_array(_chunks(body, 13))), ROWS)
+
+    def test_iter_file(self):
+        body = json.dumps(BODY).encode()
+        with tempfile.TemporaryDirectory() as directory:
+            plain = os.path.join(directory, 'btc.json')
+            with open(plain, 'wb') as file:
+                file.write(body)
+            compressed = os.path.join(directory, 'btc.json.gz')
+            with gzip.open(compressed, 'wb') as file:
+                file.write(body)
+            self.assertEqual(list(iter_file(plain, chunk_size=7)), ROWS)
+            self.assertEqual(list(iter_file(compressed, chunk_size=7)), ROWS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import json
+import os
+import tempfile
+import unittest
+
+from lunarcrush import LunarCrushV4
+from lunarcrush.transport import InProcessTransport, ReplayTransport
+
+
+class ReplayTransportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.responses = []
+        self.requested = 0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def handler(self, url, headers):
+        self.requested += 1
+        status, body = self.responses.pop(0)
+        return status, {'Content-Type': 'application/json'}, json.dumps(body).encode()
+
+    def client(self, record=True):
+        transport = ReplayTransport(self.directory.name, record=record, transport=InProcessTransport(self.handler))
+        return LunarCrushV4('key', transport=transport)
+
+    def test_records_and_replays_success(self):
+        self.responses = [(200, {'data': {'topic': 'btc'}})]
+        self.assertEqual(self.client().get_topic('btc'), {'data': {'topic': 'btc'}})
+        self.assertEqual(self.client(record=False).get_topic('btc'), {'data': {'topic': 'btc'}})
+        self.assertEqual(self.requested, 1)
+
+    def test_errors_are_not_recorded(self):
+        for status in (429, 404, 503):
+            with self.subTest(status=status):
+                self.responses = [(status, {'error': 'Try again'}), (200, {'data': {'topic': 'btc'}})]
+                client = self.client()
+                self.assertEqual(client.get_topic('btc'), {'error': 'Try again'})
+                self.assertEqual(client.get_topic('btc'), {'data': {'topic': 'btc'}})
+                for name in os.listdir(self.directory.name):
+                    os.remove(os.path.join(self.directory.name, name))
+
+    def test_missing_recording(self):
+        with self.assertRaises(LookupError):
+            self.client(record=False).get_topic('btc')
+
+
+if __name__ == '__main__':
+    unittest.main()